@@ -0,0 +1,225 @@
+"""
+Наскрізний бенчмарк work_scrap.run_query без звернень до work.ua і без Firefox.
+
+Локальний HTTP-сервер віддає збережені сторінки з каталогу фікстур (bench/corpus
+або сторінки page_N.html.gz, збережені з DEBUG_MODE = True) замість work.ua: сторінка N
+запиту — це N-та фікстура по колу, а пагінація першої сторінки переписується під задану
+глибину. Затримку відповіді та частку помилок 503 можна налаштувати, щоб перевірити
+поведінку конвеєра з повторними спробами.
+
+Для кожного бекенду парсера виводить сторінки і картки за секунду (наскрізно: завантаження,
+парсинг, фільтр, запис), час парсингу сторінки та пікову пам'ять (окремий прохід із tracemalloc,
+щоб трасування не спотворювало швидкість).
+
+Використання:
+    python bench/crawl_bench.py [--fixtures bench/corpus] [--depth 20] [--latency 0.05]
+                                [--error-rate 0.05] [--repeat 3]
+"""
+import argparse
+import contextlib
+import io
+import logging
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Бенчмарк не пише workua_scraper.log: basicConfig у work_scrap стає no-op
+logging.basicConfig(handlers=[logging.NullHandler()])
+logging.disable(logging.CRITICAL)
+
+import work_scrap  # noqa: E402
+import workua_fetch  # noqa: E402
+from parser_bench import load_corpus  # noqa: E402
+from workua_fetch import ListingFetcher, TokenBucket  # noqa: E402
+from workua_metrics import METRICS  # noqa: E402
+from workua_parser import BACKENDS, lxml  # noqa: E402
+
+PAGINATION_RE = re.compile(r'<ul class="pagination">.*?</ul>', re.DOTALL)
+
+NO_RESULTS_PAGE = "<!DOCTYPE html><html><body><div id=\"pjax-job-list\"><p>Немає результатів</p></div></body></html>"
+
+
+class FixtureServer:
+    """Локальна заміна work.ua, що віддає сторінки фікстур у фоновому потоці."""
+
+    def __init__(self, pages, depth, latency=0.0, jitter=0.0, error_rate=0.0, seed=2025):
+        """
+        Args:
+            pages (list): HTML фікстур (сторінка N запиту — pages[(N - 1) % len(pages)]).
+            depth (int): Кількість сторінок у пагінації; далі — сторінка «Немає результатів».
+            latency (float): Затримка кожної відповіді в секундах.
+            jitter (float): Додаткова випадкова затримка від 0 до jitter секунд.
+            error_rate (float): Частка відповідей 503 (від 0 до 1).
+            seed (int): Початкове значення генератора для відтворюваних помилок і затримок.
+        """
+        self.pages = [page.encode("utf-8") for page in pages]
+        self.depth = depth
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        pagination = "".join(f'<li><a href="?page={page}">{page}</a></li>' for page in range(1, depth + 1))
+        self.pagination = f'<ul class="pagination">{pagination}</ul>'
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def page_body(self, page):
+        """Повертає тіло відповіді для сторінки page."""
+        if page > self.depth:
+            return NO_RESULTS_PAGE.encode("utf-8")
+        body = self.pages[(page - 1) % len(self.pages)]
+        if page == 1:
+            html = body.decode("utf-8")
+            if PAGINATION_RE.search(html):
+                html = PAGINATION_RE.sub(lambda m: self.pagination, html, count=1)
+            else:
+                html = html.replace("</body>", self.pagination + "</body>", 1)
+            body = html.encode("utf-8")
+        return body
+
+    def handle(self, request):
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+            failed = self.rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        if delay:
+            time.sleep(delay)
+        if failed:
+            request.send_response(503)
+            request.send_header("Content-Length", "0")
+            request.end_headers()
+            return
+        try:
+            page = int(parse_qs(urlparse(request.path).query).get("page", ["1"])[0])
+        except ValueError:
+            page = 1
+        body = self.page_body(page)
+        request.send_response(200)
+        request.send_header("Content-Type", "text/html; charset=utf-8")
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def crawl_once(backend, args, trace_memory=False):
+    """
+    Виконує один наскрізний запит через run_query у тимчасовому каталозі
+    (контрольні точки, сховище і результати не змішуються з робочими файлами).
+
+    Args:
+        backend (str): Бекенд парсера.
+        args (argparse.Namespace): Параметри бенчмарку.
+        trace_memory (bool): Вимірювати пікову пам'ять через tracemalloc.
+
+    Returns:
+        dict: seconds, pages, cards, records, parse_seconds, peak_bytes (або None).
+    """
+    work_scrap.PARSER_BACKEND = backend
+    METRICS.reset()
+    rate_limiter = TokenBucket(args.rps) if args.rps else None
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="workua_bench_") as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            if trace_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            with ListingFetcher(use_fallback=False, rate_limiter=rate_limiter, max_per_host=args.concurrency) as fetcher, \
+                    contextlib.redirect_stdout(io.StringIO()):
+                result = work_scrap.run_query(fetcher, args.vacancy, args.city)
+            seconds = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+            os.chdir(cwd)
+
+    parse_stage = METRICS.snapshot()["stages"].get('stage_seconds{stage="parse"}', {"sum": 0})
+    return {"seconds": seconds, "pages": METRICS.counter("pages_total"), "cards": METRICS.counter("cards_total"),
+            "records": result["records"], "parse_seconds": parse_stage["sum"], "peak_bytes": peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixtures", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus"),
+                        help="каталог зі сторінками *.html.gz / *.html")
+    parser.add_argument("--depth", type=int, default=20, help="кількість сторінок у пагінації")
+    parser.add_argument("--latency", type=float, default=0.05, help="затримка відповіді сервера, сек")
+    parser.add_argument("--jitter", type=float, default=0.0, help="додаткова випадкова затримка, сек")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="частка відповідей 503 (0–1)")
+    parser.add_argument("--concurrency", type=int, default=work_scrap.CONCURRENCY,
+                        help="кількість сторінок, що завантажуються одночасно")
+    parser.add_argument("--rps", type=float, default=0, help="обмеження запитів за секунду (0 — без обмеження)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--vacancy", default="водій")
+    parser.add_argument("--city", default="київ")
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args()
+
+    pages = [html for _, html in load_corpus(args.fixtures)]
+    if not pages:
+        print(f"❌ У {args.fixtures} немає сторінок. Згенеруйте корпус: python bench/make_corpus.py")
+        sys.exit(1)
+
+    backends = [backend for backend in BACKENDS if backend != "lxml" or lxml is not None]
+    if len(backends) < len(BACKENDS):
+        print("⚠️ lxml не встановлено, бекенд lxml пропущено")
+    work_scrap.CONCURRENCY = args.concurrency
+
+    with FixtureServer(pages, args.depth, args.latency, args.jitter, args.error_rate, args.seed) as server:
+        workua_fetch.BASE_URL = server.url
+        print(f"Фікстури: {len(pages)} сторінок, глибина {args.depth}, затримка {args.latency} с, "
+              f"помилки {args.error_rate:.0%}, одночасно {args.concurrency}, найкращий із {args.repeat} проходів\n")
+        print(f"{'Бекенд':<14}{'сек':>9}{'стор/с':>9}{'карток/с':>10}{'парсинг мс/стор':>17}{'пік МБ':>9}{'записів':>9}")
+        for backend in backends:
+            runs = [crawl_once(backend, args) for _ in range(args.repeat)]
+            best = min(runs, key=lambda run: run["seconds"])
+            peak = crawl_once(backend, args, trace_memory=True)["peak_bytes"]
+            parse_ms = best["parse_seconds"] / best["pages"] * 1000 if best["pages"] else 0
+            print(f"{backend:<14}{best['seconds']:>9.3f}{best['pages'] / best['seconds']:>9.1f}"
+                  f"{best['cards'] / best['seconds']:>10.0f}{parse_ms:>17.2f}{peak / 2 ** 20:>9.1f}{best['records']:>9}")
+        print(f"\nЗапитів до сервера: {server.requests}, з них помилок 503: {server.errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Попередній багатопрохідний парсер картки вакансії: кожне поле шукається окремим проходом
+по картці BeautifulSoup. У скрапері його замінив workua_parser.extract_card; тут він
+залишається лише як еталон швидкості та результатів для bench/parser_bench.py.
+"""
+import logging
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workua_parser import convert_iso_to_text  # noqa: E402
+
+
+def parse_job_card(job):
+    """
+    Витягує поля вакансії з картки div.job-link окремими пошуками для кожного поля.
+    Попередній варіант парсера (до workua_parser.extract_card); еталон для порівняння в parser_bench.py.
+
+    Args:
+        job (bs4.element.Tag): Картка вакансії.
+
+    Returns:
+        dict: Запис вакансії з ключами FIELDS або None, якщо картку не вдалося обробити.
+    """
+    title = "Не знайдено"
+    try:
+        title_tag = job.find("h2")
+        title = title_tag.text.strip() if title_tag else "Не знайдено"
+        logging.debug(f"Обробка вакансії: {title}")
+
+        company = "Невідомо"
+        company_div = job.find("div", class_="mt-xs")
+        if company_div:
+            company_tag = company_div.find("span", class_="strong-600")
+            if company_tag:
+                company = company_tag.text.strip()
+                logging.debug(f"Знайдено компанію: {company}")
+            else:
+                logging.debug(f"Тег компанії не знайдено в div.mt-xs для вакансії {title}")
+
+        salary = "Не вказано"
+        salary_tag = job.find("span", class_="strong-600", string=re.compile(r"\d+[  ]?\–[  ]?\d+|\d+"))
+        if salary_tag:
+            salary = salary_tag.text.strip().replace(" ", "").replace(" ", "").replace("грн", "").replace(" ", "")
+            logging.debug(f"Знайдено зарплату: {salary}")
+        else:
+            logging.debug(f"Зарплата не знайдена для вакансії {title}")
+
+        # Спроба знайти місто кількома методами через непередбачувану структуру сайту
+        # Метод 1: Пошук <span> без класу, який може містити місто
+        city = "Не вказано"
+        city_span = job.find("span", class_="")
+        if city_span:
+            city = city_span.text.strip().rstrip(",").strip()
+            logging.debug(f"Знайдено місто (метод 1): {city}")
+        # Метод 2: Пошук <span> із класом "location"
+        if city == "Не вказано":
+            city_tag_alt = job.find("span", class_="location")
+            if city_tag_alt:
+                city = city_tag_alt.text.strip()
+                logging.debug(f"Знайдено місто (метод 2): {city}")
+        # Метод 3: Аналіз <div class="mt-xs"> для пошуку тексту, схожого на місто
+        if city == "Не вказано":
+            city_block = job.find("div", class_="mt-xs")
+            if city_block:
+                found_company = False
+                for element in city_block.find_all(["span", "p"]):
+                    text = element.text.strip()
+                    if not found_company and element.find_parent("span", class_="mr-xs"):
+                        found_company = True
+                        continue
+                    match = re.match(r"^[А-ЯІЇЄҐ][а-яіїєґ\s,-]+", text)
+                    if match:
+                        city_text = match.group(0).rstrip(",").strip()
+                        if not re.search(r"[()№\d]", city_text) and not text.startswith(company.split()[0]):
+                            city = city_text.split(",")[0].strip()
+                            logging.debug(f"Знайдено місто (метод 3): {city}")
+                            break
+        # Метод 4: Використовуємо CSS-селектор для резервного пошуку міста
+        if city == "Не вказано":
+            try:
+                city_span_new = job.select_one("div.mt-xs span:nth-child(3)")
+                if city_span_new:
+                    city_text = city_span_new.text.strip().rstrip(",").strip()
+                    if re.match(r"^[А-ЯІЇЄҐ][а-яіїєґ\s,-]+$", city_text):
+                        city = city_text.split(",")[0].strip()
+                        logging.debug(f"Знайдено місто (метод 4): {city}")
+            except Exception as e:
+                logging.debug(f"Метод 4 не спрацював для вакансії {title}: {str(e)}")
+        if city == "Не вказано":
+            logging.debug(f"Місто не знайдено для вакансії {title}. HTML блоку: {job.prettify()}")
+
+        published_time = "Не вказано"
+        title_link = job.find("h2").find("a") if job.find("h2") else None
+        if title_link and "title" in title_link.attrs:
+            title_text = title_link["title"]
+            match = re.search(r"вакансія від (\d{1,2} [а-я]+ \d{4})", title_text)
+            if match:
+                published_time = match.group(1)
+                logging.debug(f"Знайдено час публікації з атрибуту title для вакансії {title}: {published_time}")
+        if published_time == "Не вказано":
+            time_tag = job.find("time")
+            if time_tag:
+                if "datetime" in time_tag.attrs:
+                    published_time = convert_iso_to_text(time_tag["datetime"])
+                    logging.debug(f"Знайдено час публікації для вакансії {title}: {published_time}")
+                else:
+                    published_time = time_tag.text.strip()
+                    logging.debug(
+                        f"Знайдено час публікації (текстовий формат) для вакансії {title}: {published_time}")
+        if published_time == "Не вказано":
+            logging.debug(f"Час публікації не знайдено для вакансії {title}. HTML блоку: {job.prettify()}")
+
+        link_tag = job.find("h2").find("a") if job.find("h2") else None
+        link = "https://www.work.ua" + link_tag["href"] if link_tag else "Посилання не знайдено"
+
+        return {"title": title, "company": company, "salary": salary, "city": city,
+                "published_time": published_time, "link": link}
+    except Exception as e:
+        logging.error(f"Помилка при обробці вакансії {title}: {str(e)}")
+        return None
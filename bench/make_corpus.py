@@ -0,0 +1,103 @@
+"""
+Генерує синтетичний корпус сторінок зі структурою карток work.ua для bench/parser_bench.py.
+
+Картки навмисно покривають усі гілки парсера: місто в span з порожнім class (метод 1),
+у span.location (метод 2), лише в тексті div.mt-xs (метод 3) і в третьому span (метод 4),
+зарплату діапазоном або одним числом, дату в атрибуті title або в <time>.
+Реальні сторінки, збережені з DEBUG_MODE = True (page_N.html.gz), можна покласти
+в той самий каталог — бенчмарк читає всі *.html.gz.
+
+Використання:
+    python bench/make_corpus.py [--pages 5] [--cards 14] [--out bench/corpus]
+"""
+import argparse
+import gzip
+import os
+import random
+
+TITLES = ["Водій категорії C", "Водій-експедитор", "Бухгалтер", "Водій автобуса", "Менеджер з продажу",
+          "Python-розробник", "Продавець-консультант", "Водій кат. В, С", "Кухар", "Оператор call-центру"]
+COMPANIES = ["Нова пошта", "Епіцентр К", "АТБ-маркет", "Rozetka", "ТОВ «Сільпо-Фуд»", "Укрзалізниця"]
+CITIES = ["Київ", "Львів", "Одеса", "Харків", "Дніпро", "Вінниця"]
+MONTHS = ["січня", "лютого", "березня", "квітня", "травня", "червня",
+          "липня", "серпня", "вересня", "жовтня", "листопада", "грудня"]
+
+
+def make_card(rng, job_id):
+    title = rng.choice(TITLES)
+    company = rng.choice(COMPANIES)
+    city = rng.choice(CITIES)
+    day, month = rng.randint(1, 28), rng.randint(1, 12)
+    published = f"{day} {MONTHS[month - 1]} 2025"
+
+    salary_kind = rng.random()
+    if salary_kind < 0.45:
+        low = rng.randint(10, 40)
+        salary = f"{low} 000 – {low + rng.randint(5, 30)} 000 грн"
+    elif salary_kind < 0.75:
+        salary = f"{rng.randint(10, 80)} 000 грн"
+    else:
+        salary = None
+    salary_html = f'<div><span class="strong-600">{salary}</span></div>' if salary else ""
+
+    if rng.random() < 0.7:
+        title_attr = f' title="{title}, вакансія від {published}"'
+        time_html = ""
+    else:
+        title_attr = ""
+        time_html = f'<time datetime="2025-{month:02d}-{day:02d} 10:00:00">{day} {MONTHS[month - 1]}</time>'
+
+    city_kind = rng.random()
+    if city_kind < 0.55:
+        city_html = f'<span class="">{city},</span> <span>Повна зайнятість</span>'
+    elif city_kind < 0.75:
+        city_html = f'<span class="location">{city}</span>'
+    elif city_kind < 0.95:
+        city_html = f'<span>{city}, {rng.randint(1, 9)} км від центру</span>'
+    else:
+        city_html = ""
+
+    return f'''
+<div class="card card-hover card-search card-visited wordwrap job-link js-job-link-blank mt-lg" id="job-{job_id}">
+  <div class="row"><div class="col-sm-10">
+    <h2 class="my-0"><a href="/jobs/{job_id}/"{title_attr}>{title}</a></h2>
+  </div></div>
+  {salary_html}
+  <div class="mt-xs"><span class="mr-xs"><span class="strong-600">{company}</span></span>
+    {city_html}
+  </div>
+  <p class="ellipsis ellipsis-line ellipsis-line-3 text-default-7 mb-0">Опис вакансії {job_id}: графік, умови, вимоги.</p>
+  <div class="mt-sm"><span class="label label-orange-light">Гаряча</span>{time_html}</div>
+</div>'''
+
+
+def make_page(rng, page, cards, total_pages):
+    body = "".join(make_card(rng, page * 1000 + i) for i in range(cards))
+    pagination = "".join(f'<li><a href="/jobs-kyiv-vodii/?page={p}">{p}</a></li>' for p in range(1, total_pages + 1))
+    return f'''<!DOCTYPE html>
+<html lang="uk"><head><meta charset="utf-8"><title>Вакансії — Work.ua</title>
+<script>window.dataLayer = window.dataLayer || [];</script></head>
+<body><div id="pjax"><div id="pjax-job-list">{body}
+<nav><ul class="pagination">{pagination}<li><a class="link-icon" href="?page={page + 1}"><span>Наступна</span></a></li></ul></nav>
+</div></div></body></html>'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--cards", type=int, default=14)
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(__file__), "corpus"))
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    os.makedirs(args.out, exist_ok=True)
+    for page in range(1, args.pages + 1):
+        path = os.path.join(args.out, f"page_{page}.html.gz")
+        with gzip.GzipFile(path, "wb", mtime=0) as f:
+            f.write(make_page(rng, page, args.cards, args.pages).encode("utf-8"))
+        print(f"✅ {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Бенчмарк парсингу карток вакансій: попередній багатопрохідний парсер (legacy_parser.parse_job_card
+на BeautifulSoup + html.parser) проти однопрохідного extract_card на кожному бекенді.
+
+Читає всі *.html.gz та *.html з каталогу корпусу (за замовчуванням bench/corpus,
+див. bench/make_corpus.py або сторінки, збережені з DEBUG_MODE = True), виводить
+швидкість у сторінках і картках за секунду та кількість записів, що відрізняються
+від результату попереднього парсера.
+
+Використання:
+    python bench/parser_bench.py [--corpus bench/corpus] [--repeat 5]
+"""
+import argparse
+import glob
+import gzip
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Бенчмарк не пише workua_scraper.log: basicConfig у work_scrap стає no-op
+logging.basicConfig(handlers=[logging.NullHandler()])
+logging.disable(logging.CRITICAL)
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from legacy_parser import parse_job_card  # noqa: E402
+from workua_parser import BACKENDS, lxml, parse_cards  # noqa: E402
+
+
+def load_corpus(corpus_dir):
+    """
+    Завантажує сторінки корпусу в пам'ять, щоб вимірювати лише парсинг.
+
+    Args:
+        corpus_dir (str): Каталог зі сторінками.
+
+    Returns:
+        list: Пари (ім'я файлу, HTML).
+    """
+    pages = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "*.html.gz")) + glob.glob(os.path.join(corpus_dir, "*.html"))):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def parse_legacy(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return [parse_job_card(job) for job in soup.find_all("div", class_="job-link")]
+
+
+def run(parse, pages, repeat):
+    """
+    Вимірює найкращий час із repeat проходів по всьому корпусу.
+
+    Returns:
+        tuple: (секунди на прохід, результати парсингу кожної сторінки).
+    """
+    best = float("inf")
+    results = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [parse(html) for _, html in pages]
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus"))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus)
+    if not pages:
+        print(f"❌ У {args.corpus} немає сторінок. Згенеруйте корпус: python bench/make_corpus.py")
+        sys.exit(1)
+
+    paths = [("попередній (html.parser)", parse_legacy)]
+    for backend in BACKENDS:
+        if backend == "lxml" and lxml is None:
+            print("⚠️ lxml не встановлено, бекенд lxml пропущено")
+            continue
+        paths.append((f"однопрохідний ({backend})", lambda html, backend=backend: parse_cards(html, backend)))
+
+    baseline_time, baseline = run(paths[0][1], pages, args.repeat)
+    cards = sum(len(records) for records in baseline)
+    print(f"Корпус: {len(pages)} сторінок, {cards} карток, найкращий із {args.repeat} проходів\n")
+    print(f"{'Парсер':<28}{'сек':>9}{'стор/с':>10}{'карток/с':>11}{'прискор.':>10}{'розбіжн.':>10}")
+    for name, parse in paths:
+        elapsed, results = (baseline_time, baseline) if parse is paths[0][1] else run(parse, pages, args.repeat)
+        mismatches = sum(a != b for page_a, page_b in zip(baseline, results) for a, b in zip(page_a, page_b))
+        mismatches += sum(abs(len(page_a) - len(page_b)) for page_a, page_b in zip(baseline, results))
+        print(f"{name:<28}{elapsed:>9.4f}{len(pages) / elapsed:>10.1f}{cards / elapsed:>11.0f}"
+              f"{baseline_time / elapsed:>9.1f}x{mismatches:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from PIL import Image
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from image_index import ImageIndex, dhash
+from image_probe import image_format, probe_size
+from workua_fetch import USER_AGENT
+
+CHUNK_SIZE = 64 * 1024  # Розмір фрагмента при потоковому записі на диск
+PROBE_CHUNK_SIZE = 4 * 1024  # Скільки байтів читати за раз, поки розмір зображення ще невідомий
+PROBE_LIMIT = 256 * 1024  # Якщо розмір не знайдено в цих байтах, файл перевіряється через PIL після завантаження
+
+
+def create_image_session(pool_size=8, retries=2):
+    """
+    Створює requests.Session для завантаження зображень з пулом з'єднань.
+
+    Args:
+        pool_size (int): Максимальна кількість з'єднань у пулі для одного хоста.
+        retries (int): Кількість повторних спроб при помилках мережі або сервера.
+
+    Returns:
+        requests.Session: Налаштована сесія.
+    """
+    session = requests.Session()
+    retry = Retry(total=retries, backoff_factor=0.3,
+                  status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=("GET", "HEAD"))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT, "Accept": "image/*,*/*;q=0.8"})
+    return session
+
+
+class ImageDownloader:
+    """
+    Завантажує повнорозмірні зображення обмеженим пулом потоків, поки пошук URL триває.
+    Розмір зображення визначається із заголовка в перших кілобайтах відповіді (image_probe):
+    замале зображення не завантажується далі, а для придатного вже прочитані байти
+    стають початком файлу. Тіло пишеться на диск фрагментами у тимчасовий файл .part,
+    який після перевірки на дублікати (image_index.ImageIndex каталогу) стає image_N.jpg.
+    """
+
+    def __init__(self, output_dir, workers=8, min_width=800, min_height=600, limit=None, session=None, timeout=10):
+        """
+        Args:
+            output_dir (str): Каталог для збережених зображень.
+            workers (int): Кількість одночасних завантажень.
+            min_width (int): Мінімальна ширина зображення.
+            min_height (int): Мінімальна висота зображення.
+            limit (int): Максимальна кількість збережених зображень (None — без обмеження).
+            session (requests.Session): Готова сесія (за замовчуванням створюється нова).
+            timeout (int): Тайм-аут HTTP-запиту в секундах.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        self.min_width = min_width
+        self.min_height = min_height
+        self.session = session or create_image_session(pool_size=workers)
+        self.timeout = timeout
+        self.limit = limit
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.futures = []
+        self.index = ImageIndex(output_dir)
+        self.unique_urls = set()
+        self.saved = 0
+        self.duplicates = 0
+        self._lock = threading.Lock()
+
+    @property
+    def done(self):
+        """True, якщо вже збережено limit зображень."""
+        return self.limit is not None and self.saved >= self.limit
+
+    def submit(self, url):
+        """
+        Ставить URL у чергу на завантаження (URL, уже бачені в цьому запуску або збережені
+        в попередніх, пропускаються).
+
+        Args:
+            url (str): URL повнорозмірного зображення.
+
+        Returns:
+            concurrent.futures.Future: Результат download або None, якщо URL уже був.
+        """
+        with self._lock:
+            if url in self.unique_urls or self.index.has_url(url):
+                return None
+            self.unique_urls.add(url)
+            future = self.executor.submit(self.download, url)
+            self.futures.append(future)
+        return future
+
+    def _reserve(self):
+        """
+        Зараховує зображення в limit; False, якщо ліміт уже вичерпано. Викликається з ImageIndex.add
+        під замком індексу, коли зображення точно нове і одразу зберігається, тож лічильник saved
+        ніколи не зменшується і done не спрацьовує передчасно.
+        """
+        with self._lock:
+            if self.done:
+                return False
+            self.saved += 1
+            return True
+
+    def download(self, url):
+        """
+        Завантажує зображення потоково та зберігає його, якщо воно не менше за мінімальний розмір.
+        Якщо заголовок показує, що зображення замале, з'єднання закривається без дочитування тіла.
+
+        Args:
+            url (str): URL зображення.
+
+        Returns:
+            dict: url, path (None, якщо зображення пропущено), width, height,
+                  size (прочитано байтів), aborted (завантаження перервано після заголовка),
+                  duplicate (ім'я вже збереженого файлу з тим самим зображенням) або error.
+        """
+        if self.done:
+            return {"url": url, "path": None}
+        part_path = os.path.join(self.output_dir, f".download_{threading.get_ident()}.part")
+        try:
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                head, dimensions = b"", None
+                while dimensions is None and len(head) < PROBE_LIMIT:
+                    chunk = response.raw.read(PROBE_CHUNK_SIZE, decode_content=True)
+                    if not chunk:
+                        break
+                    head += chunk
+                    if len(head) >= 12 and image_format(head) is None:
+                        # Формат без розбору заголовка: перевіримо через PIL після завантаження
+                        break
+                    dimensions = probe_size(head)
+                if dimensions is not None and (dimensions[0] < self.min_width or dimensions[1] < self.min_height):
+                    width, height = dimensions
+                    print(f"Зображення пропущено (мала роздільна здатність): {url[:50]}... "
+                          f"({width}x{height}, прочитано {len(head)} байтів)")
+                    return {"url": url, "path": None, "width": width, "height": height, "size": len(head),
+                            "aborted": True}
+
+                size = len(head)
+                digest = hashlib.sha256(head)
+                with open(part_path, "wb") as f:
+                    f.write(head)
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        f.write(chunk)
+                        digest.update(chunk)
+                        size += len(chunk)
+            if dimensions is None:
+                # Image.open читає лише заголовок файлу, декодування всього зображення не потрібне
+                with Image.open(part_path) as img:
+                    dimensions = img.size
+            width, height = dimensions
+            if width >= self.min_width and height >= self.min_height:
+                perceptual_hash = dhash(part_path)
+        except Exception as e:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            print(f"Помилка завантаження зображення {url[:50]}...: {e}")
+            return {"url": url, "path": None, "error": str(e)}
+
+        if width < self.min_width or height < self.min_height:
+            os.remove(part_path)
+            print(f"Зображення пропущено (мала роздільна здатність): {url[:50]}... ({width}x{height})")
+            return {"url": url, "path": None, "width": width, "height": height, "size": size}
+
+        filename, duplicate = self.index.add(part_path, url, digest.hexdigest(), perceptual_hash, width, height, size,
+                                             accept=self._reserve)
+        if duplicate is not None:
+            os.remove(part_path)
+            with self._lock:
+                self.duplicates += 1
+            print(f"Зображення пропущено (дублікат {duplicate}): {url[:50]}...")
+            return {"url": url, "path": None, "width": width, "height": height, "size": size, "duplicate": duplicate}
+        if filename is None:
+            # Поки файл завантажувався, інші потоки вже зібрали потрібну кількість
+            os.remove(part_path)
+            return {"url": url, "path": None, "width": width, "height": height, "size": size}
+        print(f"Зображення додано та завантажено: {url[:50]}... ({width}x{height}, {size} байтів)")
+        return {"url": url, "path": filename, "width": width, "height": height, "size": size}
+
+    def close(self, wait=True):
+        """Чекає на завершення завантажень (або скасовує ті, що ще не почались) і закриває сесію."""
+        if not wait:
+            for future in self.futures:
+                future.cancel()
+        self.executor.shutdown(wait=True)
+        self.session.close()
+        self.index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(wait=exc_type is None)
@@ -0,0 +1,209 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from PIL import Image
+
+INDEX_FILE = "images.sqlite3"  # Індекс зберігається в каталозі зображень
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    number INTEGER PRIMARY KEY,
+    filename TEXT NOT NULL,
+    url TEXT,
+    sha256 TEXT NOT NULL UNIQUE,
+    dhash TEXT NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    size INTEGER,
+    added_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS images_url ON images (url);
+"""
+
+
+def dhash(path, hash_size=8):
+    """
+    Обчислює перцептивний різницевий хеш (dHash): зображення зменшується до (hash_size + 1) x hash_size
+    у відтінках сірого, і кожен біт показує, чи яскравіший піксель за сусіда праворуч.
+    Однакові картинки з різним стисненням чи розміром дають близькі хеші.
+
+    Args:
+        path (str): Шлях до зображення.
+        hash_size (int): Сторона хешу (8 — 64 біти).
+
+    Returns:
+        int: Хеш.
+    """
+    with Image.open(path) as img:
+        # Для JPEG декодер одразу зменшує зображення, повне декодування не потрібне
+        img.draft("L", (hash_size * 8, hash_size * 8))
+        pixels = list(img.convert("L").resize((hash_size + 1, hash_size), Image.BILINEAR).getdata())
+    value = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def hamming(a, b):
+    """Кількість бітів, якими відрізняються два хеші."""
+    return bin(a ^ b).count("1")
+
+
+class BKTree:
+    """
+    BK-дерево для пошуку хешів у межах відстані Хеммінга без перебору всіх записів.
+    Вузол — [хеш, елемент, {відстань: дочірній вузол}].
+    """
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, value, item):
+        if self.root is None:
+            self.root = [value, item, {}]
+            return
+        node = self.root
+        while True:
+            distance = hamming(value, node[0])
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, item, {}]
+                return
+            node = child
+
+    def search(self, value, max_distance):
+        """
+        Args:
+            value (int): Хеш для пошуку.
+            max_distance (int): Максимальна відстань Хеммінга.
+
+        Returns:
+            list: Пари (відстань, елемент), відсортовані за відстанню.
+        """
+        found = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= max_distance:
+                found.append((distance, node[1]))
+            # Нерівність трикутника: далі лише гілки з відстанню в межах [d - max, d + max]
+            for child_distance, child in node[2].items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return sorted(found)
+
+
+class ImageIndex:
+    """
+    Постійний індекс збережених зображень одного каталогу: SHA-256 (точні копії),
+    dHash (майже однакові картинки з різних CDN або з іншим стисненням) та URL.
+    Номери файлів image_N.jpg продовжуються між запусками, тож старі файли не перезаписуються.
+    """
+
+    def __init__(self, output_dir, max_distance=6):
+        """
+        Args:
+            output_dir (str): Каталог зображень (у ньому створюється images.sqlite3).
+            max_distance (int): Відстань Хеммінга між dHash, за якої зображення вважаються однаковими.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        self.max_distance = max_distance
+        # Зображення додаються з потоків завантажувача, тому доступ через спільне з'єднання під замком
+        self.conn = sqlite3.connect(os.path.join(output_dir, INDEX_FILE), check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.tree = BKTree()
+        self.urls = set()
+        self.hashes = set()
+        for filename, url, sha256, value in self.conn.execute("SELECT filename, url, sha256, dhash FROM images"):
+            self.tree.add(int(value, 16), filename)
+            self.hashes.add(sha256)
+            if url:
+                self.urls.add(url)
+        self.next_number = (self.conn.execute("SELECT MAX(number) FROM images").fetchone()[0] or 0) + 1
+
+    def has_url(self, url):
+        """True, якщо зображення з цього URL уже збережене в одному з запусків."""
+        with self.lock:
+            return url in self.urls
+
+    def find_duplicate(self, sha256, value):
+        """
+        Шукає вже збережене зображення, однакове за вмістом або за перцептивним хешем.
+
+        Args:
+            sha256 (str): SHA-256 файлу.
+            value (int): dHash зображення.
+
+        Returns:
+            str: Ім'я файлу дубліката або None.
+        """
+        with self.lock:
+            return self._find_duplicate(sha256, value)
+
+    def _find_duplicate(self, sha256, value):
+        if sha256 in self.hashes:
+            return self.conn.execute("SELECT filename FROM images WHERE sha256 = ?", (sha256,)).fetchone()[0]
+        found = self.tree.search(value, self.max_distance)
+        return found[0][1] if found else None
+
+    def add(self, part_path, url, sha256, value, width, height, size, accept=None):
+        """
+        Переносить завантажений файл під новим ім'ям image_N.jpg і записує його в індекс,
+        якщо такого зображення ще немає (перевірка і запис — під одним замком).
+        Номер береться після найбільшого в індексі й пропускає файли, що вже є на диску.
+
+        Args:
+            part_path (str): Тимчасовий файл із зображенням.
+            url (str): URL зображення.
+            sha256 (str): SHA-256 файлу.
+            value (int): dHash зображення.
+            width (int): Ширина.
+            height (int): Висота.
+            size (int): Розмір файлу в байтах.
+            accept (callable): Викликається під тим самим замком, коли зображення нове, безпосередньо
+                перед збереженням (наприклад, щоб зарахувати його в ліміт); False — не зберігати.
+
+        Returns:
+            tuple: (шлях до збереженого файлу, None), (None, ім'я файлу дубліката)
+                   або (None, None), якщо accept відхилив зображення.
+        """
+        with self.lock:
+            duplicate = self._find_duplicate(sha256, value)
+            if duplicate is not None:
+                return None, duplicate
+            if accept is not None and not accept():
+                return None, None
+            number = self.next_number
+            while os.path.exists(os.path.join(self.output_dir, f"image_{number}.jpg")):
+                number += 1
+            self.next_number = number + 1
+            filename = f"image_{number}.jpg"
+            path = os.path.join(self.output_dir, filename)
+            os.replace(part_path, path)
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO images (number, filename, url, sha256, dhash, width, height, size, added_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (number, filename, url, sha256, f"{value:016x}", width, height, size,
+                     datetime.now().isoformat(timespec="seconds")))
+            self.tree.add(value, filename)
+            self.hashes.add(sha256)
+            self.urls.add(url)
+        return path, None
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
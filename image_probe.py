@@ -0,0 +1,100 @@
+import struct
+
+# Маркери JPEG SOFn, після яких ідуть висота і ширина кадру (C4, C8, CC — інші сегменти)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# Маркери JPEG без поля довжини
+JPEG_STANDALONE_MARKERS = {0x01, 0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8, 0xD9}
+
+
+def image_format(data):
+    """
+    Визначає формат зображення за сигнатурою на початку файлу.
+
+    Args:
+        data (bytes): Перші байти файлу (достатньо 12).
+
+    Returns:
+        str: "jpeg", "png", "gif", "webp" або None, якщо формат не підтримується.
+    """
+    if data[:3] == b"\xff\xd8\xff":
+        return "jpeg"
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "png"
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def _jpeg_size(data):
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xFF:
+            # Пошкоджений потік: шукаємо наступний маркер
+            offset += 1
+            continue
+        marker = data[offset + 1]
+        if marker == 0xFF:
+            # Заповнювальні байти 0xFF перед маркером
+            offset += 1
+            continue
+        if marker in JPEG_STANDALONE_MARKERS:
+            offset += 2
+            continue
+        if marker in JPEG_SOF_MARKERS:
+            if offset + 9 > len(data):
+                return None
+            height, width = struct.unpack(">HH", data[offset + 5:offset + 9])
+            return width, height
+        # Пропускаємо сегмент (APPn з EXIF, таблиці тощо) за його довжиною
+        segment_length = struct.unpack(">H", data[offset + 2:offset + 4])[0]
+        offset += 2 + segment_length
+    return None
+
+
+def _webp_size(data):
+    if len(data) < 30:
+        return None
+    chunk = data[12:16]
+    if chunk == b"VP8 ":
+        # Ключовий кадр: стартовий код 9d 01 2a, далі 14-бітні ширина і висота
+        if data[23:26] != b"\x9d\x01\x2a":
+            return None
+        width, height = struct.unpack("<HH", data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L":
+        bits = struct.unpack("<I", data[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        width = int.from_bytes(data[24:27], "little") + 1
+        height = int.from_bytes(data[27:30], "little") + 1
+        return width, height
+    return None
+
+
+def probe_size(data):
+    """
+    Визначає розміри зображення лише із заголовка, без декодування.
+
+    Args:
+        data (bytes): Початок файлу (для PNG, GIF і WebP достатньо 30 байтів;
+                      для JPEG — до першого сегмента SOF, зазвичай кілька КБ).
+
+    Returns:
+        tuple: (ширина, висота) або None, якщо формат не підтримується чи байтів ще замало.
+    """
+    kind = image_format(data)
+    if kind == "jpeg":
+        return _jpeg_size(data)
+    if kind == "png":
+        if len(data) < 24 or data[12:16] != b"IHDR":
+            return None
+        return struct.unpack(">II", data[16:24])
+    if kind == "gif":
+        if len(data) < 10:
+            return None
+        return struct.unpack("<HH", data[6:10])
+    if kind == "webp":
+        return _webp_size(data)
+    return None
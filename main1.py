@@ -1,111 +1,199 @@
-import time
+import argparse
+from itertools import islice
 from selenium import webdriver
 from selenium.webdriver.firefox.service import Service
 from selenium.webdriver.firefox.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import requests
-from PIL import Image
-import io
-import os
-from bs4 import BeautifulSoup
-from urllib.parse import unquote  # Додано для декодування URL
-
-# Налаштування Firefox для x64
-service = Service(executable_path="F:\\PythonProject2\\geckodriver.exe")
-options = Options()
-# options.add_argument("--headless")
-driver = webdriver.Firefox(service=service, options=options)
-driver.set_window_size(1920, 1080)
-print("Firefox запущено")
-
-try:
-    url = "https://www.google.com/search?q=default+Images+high+resolution&tbm=isch"
-    driver.get(url)
-    print(f"Завантаження сторінки: {url}")
-    WebDriverWait(driver, 15).until(
-        lambda driver: len(driver.find_elements(By.CSS_SELECTOR, "img.YQ4gaf")) > 0
-    )
-except TimeoutException:
-    print("Тайм-аут: сторінка не завантажилась або немає прев’ю.")
-    print("Знайдено прев’ю перед тайм-аутом:", len(driver.find_elements(By.CSS_SELECTOR, "img.YQ4gaf")))
-    print("Частина HTML для дебагу:", driver.page_source[:10000])
-    driver.quit()
-    exit()
-except Exception as e:
-    print(f"Помилка завантаження сторінки: {e}")
-    driver.quit()
-    exit()
-
-# Прокрутка сторінки
-for _ in range(10):
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(1)
-print("Сторінка прокручена")
-
-# Знаходимо прев’ю-зображення через Selenium
-try:
-    thumbnails = driver.find_elements(By.CSS_SELECTOR, "img.YQ4gaf")
-    print(f"Знайдено {len(thumbnails)} прев’ю-зображень")
-except Exception as e:
-    print(f"Помилка пошуку прев’ю: {e}")
-    print("Частина HTML для дебагу:", driver.page_source[:10000])
-    thumbnails = []
-
-# Створюємо папку
-os.makedirs("practice_images/elphie", exist_ok=True)
-
-# Унікальні повнорозмірні зображення із завантаженням у реальному часі
-unique_urls = set()
-count = 0
+from selenium.common.exceptions import TimeoutException
+from urllib.parse import quote_plus, unquote  # Додано для декодування URL
+
+from image_download import ImageDownloader
+
+SEARCH_URL = "https://www.google.com/search?q={query}&tbm=isch"
+QUERY = "default Images high resolution"
+OUTPUT_DIR = "practice_images/elphie"
 MIN_WIDTH, MIN_HEIGHT = 800, 600
-for i, thumb in enumerate(thumbnails[:50], 1):
-    print(f"Обробка прев’ю {i}...")
-    try:
-        driver.execute_script("arguments[0].click();", thumb)
-        time.sleep(2)
-
-        # Парсимо HTML для отримання <a href="...">
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        link = soup.select_one("a[href*='imgres']")
-        if link and "imgurl=" in link['href']:
-            encoded_src = link['href'].split("imgurl=")[1].split("&")[0]
-            src = unquote(encoded_src)  # Декодуємо URL
-            print(f"Декодований URL: {src[:50]}...")
-            if src and src.startswith("http") and src not in unique_urls:
-                try:
-                    response = requests.get(src, timeout=5)
-                    img = Image.open(io.BytesIO(response.content))
-                    width, height = img.size
-
-                    if width >= MIN_WIDTH and height >= MIN_HEIGHT:
-                        unique_urls.add(src)
-                        count += 1
-                        filename = f"practice_images/elphie/image_{count}.jpg"
-                        with open(filename, "wb") as f:
-                            f.write(response.content)
-                        print(
-                            f"Зображення додано та завантажено: {src[:50]}... ({width}x{height}, {len(response.content)} байтів)")
-                    else:
-                        print(f"Зображення пропущено (мала роздільна здатність): {src[:50]}... ({width}x{height})")
-                except Exception as e:
-                    print(f"Помилка завантаження зображення {i}: {e}")
-        else:
+MAX_THUMBNAILS = 200  # Скільки прев'ю переглядати щонайбільше
+TARGET_COUNT = 10  # Скільки зображень зберегти
+DOWNLOAD_WORKERS = 8  # Кількість одночасних завантажень
+SCROLL_TIMEOUT = 3  # Скільки чекати на нові прев'ю після прокрутки, секунд
+MAX_IDLE_SCROLLS = 2  # Після стількох прокруток без нових прев'ю вважаємо, що результати скінчились
+
+THUMBNAIL_SELECTOR = "img.YQ4gaf"
+
+# Усі посилання imgres на сторінці одним викликом, без повторного парсингу page_source
+IMGRES_LINKS_JS = "return Array.from(document.querySelectorAll(\"a[href*='imgres']\"), a => a.href);"
+
+
+def create_driver():
+    # Налаштування Firefox для x64
+    service = Service(executable_path="F:\\PythonProject2\\geckodriver.exe")
+    options = Options()
+    # options.add_argument("--headless")
+    driver = webdriver.Firefox(service=service, options=options)
+    driver.set_window_size(1920, 1080)
+    print("Firefox запущено")
+    return driver
+
+
+def harvest_thumbnails(driver, stop=None, timeout=SCROLL_TIMEOUT, max_idle_scrolls=MAX_IDLE_SCROLLS):
+    """
+    Поступово прокручує сторінку і віддає нові прев'ю, щойно вони з'являються.
+    Замість фіксованих пауз чекає, поки кількість прев'ю на сторінці зросте.
+
+    Args:
+        driver (webdriver.Firefox): Драйвер браузера.
+        stop (callable): Якщо повертає True, прокрутка припиняється (наприклад, зібрано досить зображень).
+        timeout (int): Скільки чекати на нові прев'ю після однієї прокрутки, секунд.
+        max_idle_scrolls (int): Скільки прокруток поспіль без нових прев'ю завершують пошук.
+
+    Yields:
+        WebElement: Прев'ю в порядку появи на сторінці.
+    """
+    seen = 0
+    idle_scrolls = 0
+    while stop is None or not stop():
+        thumbnails = driver.find_elements(By.CSS_SELECTOR, THUMBNAIL_SELECTOR)
+        if len(thumbnails) > seen:
+            print(f"Знайдено {len(thumbnails) - seen} нових прев’ю (усього {len(thumbnails)})")
+            for thumb in thumbnails[seen:]:
+                yield thumb
+                if stop is not None and stop():
+                    return
+            seen = len(thumbnails)
+
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        try:
+            WebDriverWait(driver, timeout).until(
+                lambda driver: len(driver.find_elements(By.CSS_SELECTOR, THUMBNAIL_SELECTOR)) > seen
+            )
+            idle_scrolls = 0
+        except TimeoutException:
+            idle_scrolls += 1
+            if idle_scrolls >= max_idle_scrolls:
+                print(f"Нових прев’ю немає, прокрутку завершено (переглянуто {seen})")
+                return
+
+
+def imgurl_from_href(href):
+    """
+    Витягує URL повнорозмірного зображення з посилання imgres.
+
+    Args:
+        href (str): Посилання виду ".../imgres?imgurl=...&...".
+
+    Returns:
+        str: Декодований URL зображення або None.
+    """
+    if not href or "imgurl=" not in href:
+        return None
+    src = unquote(href.split("imgurl=")[1].split("&")[0])
+    return src if src.startswith("http") else None
+
+
+def discover_image_urls(driver, thumbnails, timeout=3):
+    """
+    Клікає по прев'ю і віддає URL повнорозмірних зображень, щойно вони з'являються на сторінці.
+    Замість фіксованої паузи після кліку чекає на нове посилання imgres.
+
+    Args:
+        driver (webdriver.Firefox): Драйвер браузера.
+        thumbnails (list): Елементи прев'ю.
+        timeout (int): Скільки чекати на нове посилання після кліку, секунд.
+
+    Yields:
+        str: URL зображення (кожен лише один раз).
+    """
+    seen = set(driver.execute_script(IMGRES_LINKS_JS))
+    for i, thumb in enumerate(thumbnails, 1):
+        print(f"Обробка прев’ю {i}...")
+        try:
+            driver.execute_script("arguments[0].click();", thumb)
+            new_links = WebDriverWait(driver, timeout).until(
+                lambda driver: [href for href in driver.execute_script(IMGRES_LINKS_JS) if href not in seen]
+            )
+        except TimeoutException:
             print(f"Помилка обробки прев’ю {i}: Не знайдено посилання imgres")
-            print("Частина HTML після кліку:", driver.page_source[:10000])
-            links = soup.select("a[href]")
-            print(f"Знайдено {len(links)} посилань <a>:")
-            for j, l in enumerate(links[:5], 1):
-                href = l.get('href')
-                print(f"Посилання {j}: {href[:100] if href else 'Без href'}...")
-        time.sleep(1)
+            continue
+        except Exception as e:
+            print(f"Помилка обробки прев’ю {i}: {e}")
+            continue
+        for href in new_links:
+            seen.add(href)
+            src = imgurl_from_href(href)
+            if src:
+                print(f"Декодований URL: {src[:50]}...")
+                yield src
+
+
+def collect_images(query=QUERY, target_count=TARGET_COUNT, min_width=MIN_WIDTH, min_height=MIN_HEIGHT,
+                   output_dir=OUTPUT_DIR, max_thumbnails=MAX_THUMBNAILS, workers=DOWNLOAD_WORKERS):
+    """
+    Шукає зображення в Google Images і зберігає до target_count зображень не менших за min_width x min_height.
+    Прокрутка, кліки по прев'ю та завантаження йдуть одночасно і зупиняються, щойно зібрано досить.
+
+    Args:
+        query (str): Пошуковий запит.
+        target_count (int): Скільки зображень зберегти.
+        min_width (int): Мінімальна ширина зображення.
+        min_height (int): Мінімальна висота зображення.
+        output_dir (str): Каталог для зображень.
+        max_thumbnails (int): Скільки прев'ю переглядати щонайбільше.
+        workers (int): Кількість одночасних завантажень.
+
+    Returns:
+        int: Кількість збережених зображень.
+    """
+    url = SEARCH_URL.format(query=quote_plus(query))
+    driver = create_driver()
+    try:
+        driver.get(url)
+        print(f"Завантаження сторінки: {url}")
+        WebDriverWait(driver, 15).until(
+            lambda driver: len(driver.find_elements(By.CSS_SELECTOR, THUMBNAIL_SELECTOR)) > 0
+        )
+    except TimeoutException:
+        print("Тайм-аут: сторінка не завантажилась або немає прев’ю.")
+        print("Знайдено прев’ю перед тайм-аутом:", len(driver.find_elements(By.CSS_SELECTOR, THUMBNAIL_SELECTOR)))
+        print("Частина HTML для дебагу:", driver.page_source[:10000])
+        driver.quit()
+        return 0
     except Exception as e:
-        print(f"Помилка обробки прев’ю {i}: {e}")
-    if count >= 10:
-        break
+        print(f"Помилка завантаження сторінки: {e}")
+        driver.quit()
+        return 0
+
+    # Прокрутка, пошук URL і завантаження йдуть паралельно: браузер гортає і клікає далі, поки пул качає зображення
+    try:
+        with ImageDownloader(output_dir, workers=workers, min_width=min_width, min_height=min_height,
+                             limit=target_count) as downloader:
+            thumbnails = harvest_thumbnails(driver, stop=lambda: downloader.done)
+            for src in discover_image_urls(driver, islice(thumbnails, max_thumbnails)):
+                downloader.submit(src)
+                if downloader.done:
+                    break
+    finally:
+        driver.quit()
+    return downloader.saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Збирає зображення з Google Images")
+    parser.add_argument("query", nargs="?", default=QUERY, help="пошуковий запит")
+    parser.add_argument("-n", "--count", type=int, default=TARGET_COUNT, help="скільки зображень зберегти")
+    parser.add_argument("--min-width", type=int, default=MIN_WIDTH, help="мінімальна ширина зображення")
+    parser.add_argument("--min-height", type=int, default=MIN_HEIGHT, help="мінімальна висота зображення")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help="каталог для зображень")
+    parser.add_argument("--max-thumbnails", type=int, default=MAX_THUMBNAILS, help="скільки прев'ю переглядати щонайбільше")
+    parser.add_argument("--workers", type=int, default=DOWNLOAD_WORKERS, help="кількість одночасних завантажень")
+    args = parser.parse_args()
+
+    saved = collect_images(args.query, args.count, args.min_width, args.min_height, args.output_dir,
+                           args.max_thumbnails, args.workers)
+    print(f"Завантажено {saved} унікальних зображень")
+    print(f"Готово! Перевірте папку {args.output_dir}")
+
 
-print(f"Завантажено {count} унікальних зображень")
-driver.quit()
-print("Готово! Перевірте папку practice_images/train")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,18 @@
-import requests
 from bs4 import BeautifulSoup
-import csv
 import logging
 import re
-import time
-import unicodedata
-import random
 import os
 import gzip
-from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.firefox.service import Service
-from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from datetime import date
+from workua_fetch import NO_RESULTS_RE, AdaptiveRateLimiter, ListingFetcher, build_listing_url, crawl_pages, has_job_cards
+from workua_pipeline import COLUMNAR_EXTENSIONS, DETAIL_FIELDS, FIELDS, external_sort, open_sink, pa, read_records
+from workua_cache import HttpCache, page_digest
+from workua_details import DetailEnricher, DetailStore
+from workua_checkpoint import CheckpointStore
+from workua_store import JobStore
+from workua_parser import DEFAULT_BACKEND, MONTHS, parse_cards
+from workua_matcher import get_matcher
+from workua_metrics import METRICS
 
 # Налаштування логування
 logging.basicConfig(filename="workua_scraper.log", level=logging.INFO)
@@ -22,84 +20,113 @@ logging.basicConfig(filename="workua_scraper.log", level=logging.INFO)
 # Конфігурація дебагінгу
 DEBUG_MODE = False  # Увімкнути для збереження всіх HTML-файлів
 
-
-def create_vacancy_pattern(search_vacancy):
+# Конфігурація парсера
+PARSER_BACKEND = DEFAULT_BACKEND  # "lxml" (якщо встановлено) або "html.parser"
+
+# Конфігурація краулера
+CONCURRENCY = 4  # Кількість сторінок, що завантажуються одночасно (1 — послідовно)
+REQUESTS_PER_SECOND = 2  # Початкова частота запитів до work.ua
+MIN_REQUESTS_PER_SECOND = 0.2  # Нижня межа частоти при 429/5xx і повільних відповідях
+MAX_REQUESTS_PER_SECOND = 4  # Верхня межа частоти, до якої вона росте, поки сервер відповідає швидко
+BROWSER_HEADLESS = True  # Резервний Firefox без вікна (False — для налагодження)
+
+# Конфігурація виводу
+OUTPUT_FILE = "workua_jobs.csv"  # Підсумковий файл, відсортований за зарплатою (.csv або .jsonl)
+STREAM_FILE = "workua_jobs.stream.jsonl"  # Записи дописуються сюди по мірі обробки сторінок
+SORT_CHUNK_SIZE = 5000  # Кількість записів в одному відсортованому фрагменті на диску
+COLUMNAR_FILE = None  # "workua_jobs.parquet" або ".arrow": типізований експорт, група рядків на кожну сторінку
+CHECKPOINT_DB = "workua_checkpoint.sqlite3"  # Прогрес незавершених запитів для відновлення
+CHECKPOINT_MAX_AGE_HOURS = 24  # Давніше розпочатий незавершений запит починається спочатку
+JOB_STORE_DB = "workua_jobs.sqlite3"  # Усі знайдені вакансії між запусками (ключ — посилання)
+INCREMENTAL = False  # Зупинятися на першій сторінці, де всі вакансії вже відомі зі сховища
+ENRICH_DETAILS = False  # Доповнювати записи описом, типом зайнятості й точною зарплатою зі сторінки вакансії
+DETAIL_CONCURRENCY = 4  # Кількість сторінок вакансій, що завантажуються одночасно
+DETAIL_STORE_DB = "workua_details.sqlite3"  # Вже отримані поля сторінок вакансій (повторно не завантажуються)
+HTTP_CACHE_DIR = "workua_http_cache"  # Дисковий кеш сторінок зі списком вакансій (None — вимкнути)
+HTTP_CACHE_TTL = 600  # Скільки секунд сторінка з кешу використовується без перевірки на сервері
+HTTP_CACHE_MAX_MB = 200  # Максимальний розмір кешу; найдавніше використані сторінки видаляються
+METRICS_FILE = "workua_metrics.json"  # Метрики запуску (.json або .prom для Prometheus); None — не зберігати
+
+
+class PageError(Exception):
+    """Сторінку не вдалося обробити: у ній немає ні вакансій, ні повідомлення про їх відсутність."""
+
+    def __init__(self, page):
+        super().__init__(f"Не вдалося обробити сторінку {page}")
+        self.page = page
+
+
+def parse_published_date(published_time):
     """
-    Створює регулярний вираз для пошуку вакансій за введеним запитом.
+    Перетворює текстову дату (DD місяць YYYY) у формат ISO (YYYY-MM-DD) — обернено до workua_parser.convert_iso_to_text.
 
     Args:
-        search_vacancy (str): Назва вакансії для пошуку (наприклад, "Водій").
+        published_time (str): Дата у текстовому форматі (наприклад, "15 квітня 2025").
 
     Returns:
-        str: Регулярний вираз для відповідності назви вакансії.
+        str: Дата у форматі ISO (наприклад, "2025-04-15") або None, якщо дату не вдалося розпізнати.
     """
-    vacancy_base = search_vacancy.lower().strip()
-    vacancy_base = re.escape(vacancy_base)
-    vacancy_base = unicodedata.normalize("NFKD", vacancy_base).replace("і", "i").replace("ї", "i")
-    vacancy_pattern = rf'\b(?:{vacancy_base}(?:[-\s][а-яіїєґ]+)*(?:[,.\s]*(?:кат\.?|категорії?)\s*[A-ZА-ЯІЇЄҐ]+(?:[,\s]*[A-ZА-ЯІЇЄҐ]+)*)?(?:[,.\s\(][а-яіїєґ\s\(\)]+)?)\b'
-    return vacancy_pattern
+    match = re.match(r"(\d{1,2}) ([а-яіїєґ]+) (\d{4})", published_time.strip().lower())
+    if not match or match.group(2) not in MONTHS:
+        return None
+    try:
+        return date(int(match.group(3)), MONTHS.index(match.group(2)) + 1, int(match.group(1))).isoformat()
+    except ValueError:
+        return None
 
 
-def convert_iso_to_text(iso_date):
+def parse_salary_range(salary):
     """
-    Перетворює дату у форматі ISO (YYYY-MM-DD HH:MM:SS) у текстовий формат (DD місяць YYYY).
+    Розбирає зарплату на мінімум і максимум.
 
     Args:
-        iso_date (str): Дата у форматі ISO (наприклад, "2025-04-15 12:00:00").
+        salary (str): Зарплата у текстовому форматі (наприклад, "20000", "30000–40000" або "Не вказано").
 
     Returns:
-        str: Дата у текстовому форматі (наприклад, "15 квітня 2025") або оригінальна дата, якщо формат неправильний.
+        tuple: (мінімум, максимум) у цілих числах (для однієї суми вони однакові) або None.
     """
     try:
-        date_obj = datetime.strptime(iso_date, "%Y-%m-%d %H:%M:%S")
-        months = ["січня", "лютого", "березня", "квітня", "травня", "червня",
-                  "липня", "серпня", "вересня", "жовтня", "листопада", "грудня"]
-        return f"{date_obj.day} {months[date_obj.month - 1]} {date_obj.year}"
+        if "–" in salary:
+            low, high = map(int, salary.split("–"))
+            return low, high
+        value = int(salary)
+        return value, value
     except ValueError:
-        return iso_date
-
-
-# Налаштування Selenium для Firefox
-firefox_options = Options()
-# firefox_options.add_argument("--headless")  # Вимкнено для тестування
-firefox_options.add_argument("--no-sandbox")
-firefox_options.add_argument("--disable-dev-shm-usage")
-
-# Імітація поведінки браузера
-firefox_options.set_preference("general.useragent.override",
-                               "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:129.0) Gecko/20100101 Firefox/129.0")
-
-service = Service()
-driver = webdriver.Firefox(service=service, options=firefox_options)
-
-# Введення запиту
-search_vacancy = input("🔍 Введіть назву вакансії: ").strip().lower()
-search_city = input("🌆 Введіть місто: ").strip().lower()
-page_input = input("📄 Введіть кількість сторінок для обробки (або 'всі'): ").strip().lower()
-
-# Валідація введення
-if not search_vacancy or not search_city:
-    print("❌ Помилка: вакансія та місто не можуть бути порожніми!")
-    driver.quit()
-    exit(1)
-
-# Формуємо базовий URL
-search_query = "-".join(search_vacancy.split())
-search_city_query = "-".join(search_city.split())
-base_url = f"https://www.work.ua/jobs-{search_city_query}-{search_query}/"
-
-# Визначаємо кількість сторінок
-if page_input == "всі":
-    driver.get(base_url)
-    # Явне очікування пагінації
+        return None
+
+
+def parse_salary(salary):
+    """
+    Перетворює текстове значення зарплати у числове для сортування.
+
+    Args:
+        salary (str): Зарплата у текстовому форматі (наприклад, "20000", "30000–40000" або "Не вказано").
+
+    Returns:
+        float: Середнє значення зарплати для сортування (або 0, якщо зарплата не вказана).
+    """
+    if salary == "Не вказано":
+        return 0
     try:
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "pagination"))
-        )
-    except Exception as e:
-        logging.warning(f"Не вдалося знайти пагінацію: {str(e)}")
+        if "–" in salary:
+            low, high = map(int, salary.split("–"))
+            return (low + high) / 2
+        return int(salary)
+    except ValueError:
+        return 0
+
+
+def detect_max_pages(html):
+    """
+    Визначає кількість сторінок за блоком пагінації ul.pagination.
 
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    Args:
+        html (str): HTML першої сторінки.
+
+    Returns:
+        int: Кількість сторінок (1, якщо пагінацію не знайдено).
+    """
+    soup = BeautifulSoup(html, "html.parser")
     pagination = soup.find("ul", class_="pagination")
     max_pages = 1
     if pagination:
@@ -115,251 +142,382 @@ if page_input == "всі":
             logging.warning("Не вдалося визначити кількість сторінок, використовуємо 1 сторінку")
     else:
         logging.warning("Пагінація не знайдена, обробляємо лише 1 сторінку")
-else:
-    try:
-        max_pages = int(page_input)
-        if max_pages < 1:
-            print("❌ Помилка: кількість сторінок має бути більше 0!")
-            driver.quit()
-            exit(1)
-    except ValueError:
-        print("❌ Помилка: введіть число або 'всі'!")
-        driver.quit()
-        exit(1)
+    return max_pages
 
-logging.info(f"Початок парсингу: вакансія={search_vacancy}, місто={search_city}, сторінок={max_pages}")
 
-jobs = []
+def fetch_page_count(fetcher, search_vacancy, search_city):
+    """
+    Завантажує першу сторінку запиту та визначає кількість сторінок за її пагінацією.
 
-page = 1
-while page <= max_pages:
-    if page == 1:
-        driver.get(base_url)
-    else:
-        # Імітуємо клік по кнопці "Наступна"
-        try:
-            next_button = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable(
-                    (By.XPATH, "//a[contains(@class, 'link-icon') and .//span[text()='Наступна']]"))
-            )
-            driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
-            current_url = driver.current_url
-            next_button.click()
-            WebDriverWait(driver, 10).until(
-                lambda d: d.current_url != current_url
-            )
-        except Exception as e:
-            logging.error(f"Не вдалося перейти на сторінку {page}: {str(e)}")
-            # Зберігаємо HTML для аналізу помилки
-            with gzip.open(f"page_{page}_error.html.gz", "wt", encoding="utf-8") as f:
-                f.write(driver.page_source)
-            logging.info(f"HTML сторінки {page} збережено через помилку в page_{page}_error.html.gz")
-            break
-
-    # Явне очікування контейнера PJAX
-    try:
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "pjax"))
-        )
-    except Exception as e:
-        logging.warning(f"Контейнер PJAX на сторінці {page} не знайдений: {str(e)}")
-        # Зберігаємо HTML для аналізу помилки
-        with gzip.open(f"page_{page}_error.html.gz", "wt", encoding="utf-8") as f:
-            f.write(driver.page_source)
-        logging.info(f"HTML сторінки {page} збережено через помилку в page_{page}_error.html.gz")
+    Args:
+        fetcher (ListingFetcher): Завантажувач сторінок.
+        search_vacancy (str): Назва вакансії.
+        search_city (str): Місто.
 
-    # Явне очікування вакансій
-    try:
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "job-link"))
-        )
-    except Exception as e:
-        logging.warning(f"Вакансії на сторінці {page} не знайдені: {str(e)}")
-        # Зберігаємо HTML для аналізу помилки
-        with gzip.open(f"page_{page}_error.html.gz", "wt", encoding="utf-8") as f:
-            f.write(driver.page_source)
-        logging.info(f"HTML сторінки {page} збережено через помилку в page_{page}_error.html.gz")
-        break
+    Returns:
+        tuple: (кількість сторінок, HTML першої сторінки).
 
-    # Імітуємо прокручування сторінки
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(random.uniform(1, 3))
+    Raises:
+        PageError: Перша сторінка без карток і без повідомлення про відсутність вакансій (збій, капча) —
+            кількість сторінок за нею не визначити, а вгадане значення не можна зберігати.
+    """
+    html = fetcher.fetch(build_listing_url(search_city, search_vacancy))
+    if not has_job_cards(html) and not (html and NO_RESULTS_RE.search(html)):
+        raise PageError(1)
+    return detect_max_pages(html), html
+
+
+def parse_listing(html, page, cache=None):
+    """
+    Розбирає картки вакансій на сторінці за один прохід (див. workua_parser.extract_card).
+    Якщо карток немає, зберігає HTML для аналізу помилки.
 
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    job_listing = soup.find_all("div", class_="job-link")
+    Args:
+        html (str): HTML сторінки.
+        page (int): Номер сторінки.
+        cache (HttpCache): Кеш, у якому записи зберігаються за хешем сторінки; для вже
+                           розібраної сторінки (наприклад, після відповіді 304) парсинг пропускається.
+
+    Returns:
+        list: Записи вакансій у порядку карток (None для картки, яку не вдалося обробити);
+              порожній список, якщо вакансій немає.
+    """
+    digest = page_digest(html) if cache is not None and html else None
+    job_listing = cache.get_records(digest) if digest else None
+    if job_listing is not None:
+        METRICS.inc("parse_cache_hits_total")
+    else:
+        with METRICS.timer("parse"):
+            job_listing = parse_cards(html, PARSER_BACKEND)
+        if digest and job_listing:
+            cache.put_records(digest, job_listing)
+    METRICS.inc("pages_total")
+    METRICS.inc("cards_total", len(job_listing))
     if not job_listing:
         print(f"❌ Вакансій на сторінці {page} не знайдено, зупиняємось.")
         logging.info(f"Вакансій на сторінці {page} не знайдено")
         # Зберігаємо HTML для аналізу помилки
         with gzip.open(f"page_{page}_error.html.gz", "wt", encoding="utf-8") as f:
-            f.write(soup.prettify())
+            f.write(html or "")
         logging.info(f"HTML сторінки {page} збережено через помилку в page_{page}_error.html.gz")
-        no_results = soup.find(string=re.compile("Немає результатів|Вакансії не знайдені"))
+        no_results = NO_RESULTS_RE.search(html or "")
         if no_results:
-            logging.info(f"Сторінка {page} містить повідомлення: {no_results}")
-        break
-    else:
-        logging.info(f"Знайдено {len(job_listing)} вакансій на сторінці {page}")
-        if DEBUG_MODE:
-            # Зберігаємо HTML лише за умови DEBUG_MODE
-            with gzip.open(f"page_{page}.html.gz", "wt", encoding="utf-8") as f:
-                f.write(soup.prettify())
-            logging.info(f"HTML сторінки {page} збережено в page_{page}.html.gz")
-            # Видаляємо старі файли (старше 5 сторінок)
-            old_page = page - 5
-            if old_page > 0 and os.path.exists(f"page_{old_page}.html.gz"):
-                os.remove(f"page_{old_page}.html.gz")
-                logging.info(f"Видалено старий файл page_{old_page}.html.gz")
-
-    for job in job_listing:
-        try:
-            title_tag = job.find("h2")
-            title = title_tag.text.strip() if title_tag else "Не знайдено"
-            logging.info(f"Обробка вакансії: {title}")
-
-            company = "Невідомо"
-            company_div = job.find("div", class_="mt-xs")
-            if company_div:
-                company_tag = company_div.find("span", class_="strong-600")
-                if company_tag:
-                    company = company_tag.text.strip()
-                    logging.info(f"Знайдено компанію: {company}")
-                else:
-                    logging.warning(f"Тег компанії не знайдено в div.mt-xs для вакансії {title}")
+            logging.info(f"Сторінка {page} містить повідомлення: {no_results.group(0)}")
+        return job_listing
+    logging.info(f"Знайдено {len(job_listing)} вакансій на сторінці {page}")
+    if DEBUG_MODE:
+        # Зберігаємо HTML лише за умови DEBUG_MODE (у вихідному вигляді, придатному для корпусу bench/)
+        with gzip.open(f"page_{page}.html.gz", "wt", encoding="utf-8") as f:
+            f.write(html)
+        logging.info(f"HTML сторінки {page} збережено в page_{page}.html.gz")
+        # Видаляємо старі файли (старше 5 сторінок)
+        old_page = page - 5
+        if old_page > 0 and os.path.exists(f"page_{old_page}.html.gz"):
+            os.remove(f"page_{old_page}.html.gz")
+            logging.info(f"Видалено старий файл page_{old_page}.html.gz")
+    return job_listing
+
+
+def filter_jobs(job_listing, search_vacancy, search_city):
+    """
+    Відбирає вакансії, що відповідають запиту за назвою та містом. Назви всієї сторінки
+    перевіряються одним проходом скомпільованого матчера (див. workua_matcher.get_matcher).
 
-            salary = "Не вказано"
-            salary_tag = job.find("span", class_="strong-600", string=re.compile(r"\d+[  ]?\–[  ]?\d+|\d+"))
-            if salary_tag:
-                salary = salary_tag.text.strip().replace(" ", "").replace(" ", "").replace("грн", "").replace(" ", "")
-                logging.info(f"Знайдено зарплату: {salary}")
-            else:
-                logging.warning(f"Зарплата не знайдена для вакансії {title}")
-
-            # Спроба знайти місто кількома методами через непередбачувану структуру сайту
-            # Метод 1: Пошук <span> без класу, який може містити місто
-            city = "Не вказано"
-            city_span = job.find("span", class_="")
-            if city_span:
-                city = city_span.text.strip().rstrip(",").strip()
-                logging.info(f"Знайдено місто (метод 1): {city}")
-            # Метод 2: Пошук <span> із класом "location"
-            if city == "Не вказано":
-                city_tag_alt = job.find("span", class_="location")
-                if city_tag_alt:
-                    city = city_tag_alt.text.strip()
-                    logging.info(f"Знайдено місто (метод 2): {city}")
-            # Метод 3: Аналіз <div class="mt-xs"> для пошуку тексту, схожого на місто
-            if city == "Не вказано":
-                city_block = job.find("div", class_="mt-xs")
-                if city_block:
-                    found_company = False
-                    for element in city_block.find_all(["span", "p"]):
-                        text = element.text.strip()
-                        if not found_company and element.find_parent("span", class_="mr-xs"):
-                            found_company = True
-                            continue
-                        match = re.match(r"^[А-ЯІЇЄҐ][а-яіїєґ\s,-]+", text)
-                        if match:
-                            city_text = match.group(0).rstrip(",").strip()
-                            if not re.search(r"[()№\d]", city_text) and not text.startswith(company.split()[0]):
-                                city = city_text.split(",")[0].strip()
-                                logging.info(f"Знайдено місто (метод 3): {city}")
-                                break
-            # Метод 4: Використовуємо CSS-селектор для резервного пошуку міста
-            if city == "Не вказано":
-                try:
-                    city_span_new = job.select_one("div.mt-xs span:nth-child(3)")
-                    if city_span_new:
-                        city_text = city_span_new.text.strip().rstrip(",").strip()
-                        if re.match(r"^[А-ЯІЇЄҐ][а-яіїєґ\s,-]+$", city_text):
-                            city = city_text.split(",")[0].strip()
-                            logging.info(f"Знайдено місто (метод 4): {city}")
-                except Exception as e:
-                    logging.warning(f"Метод 4 не спрацював для вакансії {title}: {str(e)}")
-            if city == "Не вказано":
-                logging.warning(f"Місто не знайдено для вакансії {title}. HTML блоку: {job.prettify()}")
-
-            published_time = "Не вказано"
-            title_link = job.find("h2").find("a") if job.find("h2") else None
-            if title_link and "title" in title_link.attrs:
-                title_text = title_link["title"]
-                match = re.search(r"вакансія від (\d{1,2} [а-я]+ \d{4})", title_text)
-                if match:
-                    published_time = match.group(1)
-                    logging.info(f"Знайдено час публікації з атрибуту title для вакансії {title}: {published_time}")
-            if published_time == "Не вказано":
-                time_tag = job.find("time")
-                if time_tag:
-                    if "datetime" in time_tag.attrs:
-                        published_time = convert_iso_to_text(time_tag["datetime"])
-                        logging.info(f"Знайдено час публікації для вакансії {title}: {published_time}")
-                    else:
-                        published_time = time_tag.text.strip()
-                        logging.info(
-                            f"Знайдено час публікації (текстовий формат) для вакансії {title}: {published_time}")
-            if published_time == "Не вказано":
-                logging.warning(f"Час публікації не знайдено для вакансії {title}. HTML блоку: {job.prettify()}")
-
-            link_tag = job.find("h2").find("a") if job.find("h2") else None
-            link = "https://www.work.ua" + link_tag["href"] if link_tag else "Посилання не знайдено"
-
-            normalized_title = unicodedata.normalize("NFKD", title.lower()).replace("і", "i").replace("ї", "i")
-            vacancy_pattern = create_vacancy_pattern(search_vacancy)
-            if re.search(vacancy_pattern, normalized_title, re.IGNORECASE):
-                logging.info(f"Вакансія {title} відповідає шаблону")
-                if city == "Не вказано" or search_city in city.lower():
-                    jobs.append([title, company, salary, city, published_time, link])
-                    print(
-                        f"Перевірка вакансії: {title} | Компанія: {company} | Зарплата: {salary} | Місто: {city} | Час публікації: {published_time}")
-                else:
-                    logging.info(
-                        f"Вакансія {title} відфільтрована через невідповідність міста: {city} (очікується {search_city})")
+    Args:
+        job_listing (list): Записи вакансій сторінки (None для карток, які не вдалося обробити).
+        search_vacancy (str): Назва вакансії з запиту.
+        search_city (str): Місто з запиту.
+
+    Returns:
+        list: Записи, які слід зберегти.
+    """
+    with METRICS.timer("filter"):
+        job_listing = [job_data for job_data in job_listing if job_data]
+        title_matches = get_matcher(search_vacancy).matches_many([job_data["title"] for job_data in job_listing])
+        accepted = []
+        for job_data, title_match in zip(job_listing, title_matches):
+            title, city = job_data["title"], job_data["city"]
+            if not title_match:
+                logging.debug(f"Назва вакансії {title} не відповідає шаблону")
+            elif city == "Не вказано" or search_city in city.lower():
+                accepted.append(job_data)
             else:
-                logging.warning(f"Назва вакансії {title} не відповідає шаблону")
+                logging.debug(f"Вакансія {title} відфільтрована через невідповідність міста: {city} (очікується {search_city})")
+    METRICS.inc("filtered_out_total", len(job_listing) - len(accepted))
+    return accepted
 
-        except Exception as e:
-            logging.error(f"Помилка при обробці вакансії {title}: {str(e)}")
 
-    print(f"✅ Сторінка {page} оброблена!")
-    logging.info(f"Сторінка {page} оброблена")
-    page += 1
-    time.sleep(random.uniform(1, 3))
+def scrape_pages(pages, search_vacancy, search_city, cache=None):
+    """
+    Потоковий конвеєр: сторінка → картки → фільтр. Записи сторінки віддаються одразу після
+    її обробки, тому в пам'яті тримається лише одна сторінка. Зупиняється на сторінці
+    з повідомленням про відсутність вакансій.
 
-# Закриваємо браузер
-driver.quit()
+    Args:
+        pages (iterable): Пари (номер сторінки, HTML) у порядку номерів.
+        search_vacancy (str): Назва вакансії з запиту.
+        search_city (str): Місто з запиту.
+        cache (HttpCache): Кеш розібраних записів (див. parse_listing).
 
+    Yields:
+        tuple: (номер сторінки, список записів вакансій, що відповідають запиту).
 
-def parse_salary(salary):
+    Raises:
+        PageError: Сторінка без вакансій і без повідомлення про їх відсутність (збій завантаження).
     """
-    Перетворює текстове значення зарплати у числове для сортування.
+    for page, html in pages:
+        job_listing = parse_listing(html, page, cache)
+        if not job_listing:
+            if html and NO_RESULTS_RE.search(html):
+                return
+            raise PageError(page)
+
+        records = filter_jobs(job_listing, search_vacancy, search_city)
+        for job_data in records:
+            print(
+                f"Перевірка вакансії: {job_data['title']} | Компанія: {job_data['company']} | Зарплата: {job_data['salary']} | Місто: {job_data['city']} | Час публікації: {job_data['published_time']}")
+
+        print(f"✅ Сторінка {page} оброблена!")
+        logging.info(f"Сторінка {page} оброблена")
+        yield page, records
+
+
+def create_rate_limiter(processes=1):
+    """
+    Створює адаптивний обмежувач частоти запитів з налаштувань REQUESTS_PER_SECOND,
+    MIN_REQUESTS_PER_SECOND і MAX_REQUESTS_PER_SECOND.
 
     Args:
-        salary (str): Зарплата у текстовому форматі (наприклад, "20000", "30000–40000" або "Не вказано").
+        processes (int): Кількість процесів, між якими ділиться частота.
 
     Returns:
-        float: Середнє значення зарплати для сортування (або 0, якщо зарплата не вказана).
+        AdaptiveRateLimiter: Обмежувач частоти.
     """
-    if salary == "Не вказано":
-        return 0
+    return AdaptiveRateLimiter(REQUESTS_PER_SECOND / processes, MIN_REQUESTS_PER_SECOND / processes,
+                               MAX_REQUESTS_PER_SECOND / processes)
+
+
+def output_fields():
+    """Поля підсумкових файлів: FIELDS, а з ENRICH_DETAILS — ще й DETAIL_FIELDS."""
+    return FIELDS + DETAIL_FIELDS if ENRICH_DETAILS else FIELDS
+
+
+def save_sorted(stream_file, output_file):
+    """
+    Сортує записи з потокового файлу за зарплатою (від найбільшої) зовнішнім сортуванням
+    і записує їх у підсумковий файл.
+
+    Args:
+        stream_file (str): Файл, у який записи дописувались під час парсингу.
+        output_file (str): Підсумковий файл (.csv або .jsonl).
+
+    Returns:
+        int: Кількість збережених записів.
+    """
+    records = external_sort(read_records(stream_file), key=lambda x: parse_salary(x["salary"]),
+                            reverse=True, chunk_size=SORT_CHUNK_SIZE)
+    with open_sink(output_file, output_fields(), salary_key=parse_salary_range, date_key=parse_published_date) as sink:
+        for record in records:
+            sink.write(record)
+    return sink.count
+
+
+def run_query(fetcher, search_vacancy, search_city, max_pages=None, output_file=OUTPUT_FILE, stream_file=STREAM_FILE,
+              columnar_file=COLUMNAR_FILE):
+    """
+    Виконує один запит (вакансія, місто): завантаження, парсинг, фільтр, сховище вакансій,
+    контрольні точки та збереження результату, відсортованого за зарплатою.
+
+    Args:
+        fetcher (ListingFetcher): Завантажувач сторінок (може використовуватись повторно).
+        search_vacancy (str): Назва вакансії.
+        search_city (str): Місто.
+        max_pages (int): Кількість сторінок для обробки (None — усі сторінки за пагінацією).
+        output_file (str): Підсумковий файл (.csv або .jsonl).
+        stream_file (str): Файл, у який записи дописуються по мірі обробки сторінок.
+        columnar_file (str): Файл Parquet/Arrow з групою рядків на кожну оброблену сторінку (None — не писати).
+            Файл стає придатним до читання після завершення запиту; після аварійного завершення
+            процесу зібрані дані залишаються лише в stream_file.
+
+    Returns:
+        dict: Підсумок запиту: vacancy, city, records (кількість збережених записів),
+              output (шлях до файлу або None), new, changed, vanished (списки посилань).
+
+    Raises:
+        PageError: Перша сторінка не завантажилась, тож кількість сторінок невідома (див. fetch_page_count).
+    """
+    checkpoint = CheckpointStore(CHECKPOINT_DB)
+
+    # HTML вже завантажених сторінок (перша сторінка потрібна для пагінації)
+    page_html = {}
+
+    if checkpoint.discard_stale(search_vacancy, search_city, CHECKPOINT_MAX_AGE_HOURS * 3600):
+        print(f"♻️ Незавершений запит старший за {CHECKPOINT_MAX_AGE_HOURS} год, починаємо спочатку")
+        logging.info(f"Контрольну точку запиту {search_vacancy} / {search_city} видалено як застарілу")
+
+    # Визначаємо кількість сторінок (для незавершеного запиту вона вже збережена).
+    # Зниклі вакансії шукаються лише тоді, коли кількість сторінок узято з пагінації першої сторінки
+    # з картками в цьому запуску: обмеження від користувача чи з контрольної точки не означає кінця результатів
+    whole_query = False
+    if max_pages is None:
+        max_pages = checkpoint.get_max_pages(search_vacancy, search_city)
+        if max_pages is None:
+            try:
+                max_pages, page_html[1] = fetch_page_count(fetcher, search_vacancy, search_city)
+            except PageError:
+                checkpoint.close()
+                raise
+            whole_query = has_job_cards(page_html[1])
+
+    checkpoint.begin(search_vacancy, search_city, max_pages)
+    store = JobStore(JOB_STORE_DB, salary_key=parse_salary, date_key=parse_published_date)
+    enricher = DetailEnricher(fetcher, DetailStore(DETAIL_STORE_DB), DETAIL_CONCURRENCY) if ENRICH_DETAILS else None
+    start_page = checkpoint.next_page(search_vacancy, search_city)
+    if start_page > 1:
+        print(f"♻️ Продовжуємо незавершений запит зі сторінки {start_page}")
+        logging.info(f"Відновлення з контрольної точки: сторінки 1–{start_page - 1} вже оброблені")
+
+    logging.info(f"Початок парсингу: вакансія={search_vacancy}, місто={search_city}, сторінок={max_pages}")
+
+    # Кількість сторінок відома наперед, тому сторінки завантажуються паралельно напряму
+    # за URL ?page=N замість кліку по кнопці "Наступна", але обробляються по порядку
+    page_urls = ((page, build_listing_url(search_city, search_vacancy, page))
+                 for page in range(start_page, max_pages + 1))
+    # В інкрементальному режимі сторінки запитуються по одній, доки не трапиться сторінка з новими
+    # вакансіями: інакше до зупинки на першій відомій сторінці вже були б завантажені наступні
+    probing = INCREMENTAL
+    pages = crawl_pages(fetcher, page_urls, workers=CONCURRENCY, prefetched=page_html,
+                        lookahead=lambda: 1 if probing else CONCURRENCY * 2)
+    run_id = store.begin_run(search_vacancy, search_city)
+    columnar = None
+    if columnar_file:
+        columnar = open_sink(columnar_file, output_fields(), salary_key=parse_salary_range,
+                             date_key=parse_published_date)
+    new_links, changed_links, vanished_links = [], [], []
     try:
-        if "–" in salary:
-            low, high = map(int, salary.split("–"))
-            return (low + high) / 2
-        return int(salary)
-    except ValueError:
-        return 0
+        # Кожен запис одразу дописується у файл, тож після збою зібрані дані не втрачаються
+        with open_sink(stream_file) as sink:
+            # Записи вже оброблених сторінок також позначаються в сховищі як побачені в цьому запуску
+            for page, records in checkpoint.pages(search_vacancy, search_city):
+                for job_data in records:
+                    sink.write(job_data)
+                    if columnar is not None:
+                        columnar.write(job_data)
+                store.upsert_page(run_id, search_vacancy, search_city, records)
+            if columnar is not None:
+                columnar.flush()
+            complete = False
+            last_page = start_page - 1
+            try:
+                for page, records in scrape_pages(pages, search_vacancy, search_city, fetcher.cache):
+                    last_page = page
+                    if enricher is not None:
+                        with METRICS.timer("enrich"):
+                            records = enricher.enrich(records)
+                    with METRICS.timer("write"):
+                        for job_data in records:
+                            sink.write(job_data)
+                            if columnar is not None:
+                                columnar.write(job_data)
+                        if columnar is not None:
+                            # Записи сторінки не лишаються в пам'яті до кінця запиту
+                            columnar.flush()
+                        statuses = store.upsert_page(run_id, search_vacancy, search_city, records)
+                        checkpoint.save_page(search_vacancy, search_city, page, records)
+                    METRICS.inc("records_total", len(records))
+                    new_links += [r["link"] for r, status in zip(records, statuses) if status == "new"]
+                    changed_links += [r["link"] for r, status in zip(records, statuses) if status == "changed"]
+                    if INCREMENTAL and statuses and all(status in ("changed", "unchanged") for status in statuses):
+                        print(f"⏹️ Усі вакансії на сторінці {page} вже відомі, зупиняємось.")
+                        logging.info(f"Інкрементальний режим: сторінка {page} не містить нових вакансій")
+                        break
+                    probing = False
+                else:
+                    # Ітерація, що закінчилась раніше max_pages, дійшла до сторінки "Немає результатів"
+                    complete = whole_query or last_page < max_pages
+                # Запит завершено — наступний запуск почнеться з першої сторінки
+                checkpoint.clear(search_vacancy, search_city)
+            except PageError as e:
+                print(f"❌ {e}. Прогрес збережено, повторний запуск продовжить зі сторінки {e.page}.")
+                logging.error(f"{e}; прогрес збережено в {CHECKPOINT_DB}")
+            # Зниклі вакансії можна визначити лише тоді, коли переглянуто всі сторінки запиту
+            vanished_links = store.finish_run(run_id, search_vacancy, search_city, complete=complete)
+    finally:
+        # Скасовуємо незавершені завантаження, якщо обробка зупинилась раніше
+        pages.close()
+        checkpoint.close()
+        store.close()
+        if columnar is not None:
+            columnar.close()
+        if enricher is not None:
+            enricher.close()
+            enricher.store.close()
+
+    print(f"📊 {search_vacancy} / {search_city}: нових вакансій: {len(new_links)}, "
+          f"змінених: {len(changed_links)}, зниклих: {len(vanished_links)}")
+    for label, links in (("Нова", new_links), ("Змінена", changed_links), ("Зникла", vanished_links)):
+        for link in links:
+            logging.info(f"{label} вакансія: {link}")
+
+    # Збереження у файл, відсортований за зарплатою
+    output = None
+    if sink.count:
+        save_sorted(stream_file, output_file)
+        output = output_file
+        print(f"✅ Вакансії збережено в {output_file}")
+        logging.info(f"Вакансії збережено в {output_file}")
+    else:
+        print(f"❌ Не знайдено жодної вакансії для збереження ({search_vacancy} / {search_city}).")
+        logging.warning(f"Не знайдено жодної вакансії: вакансія={search_vacancy}, місто={search_city}")
+    os.remove(stream_file)
+    return {"vacancy": search_vacancy, "city": search_city, "records": sink.count, "output": output,
+            "new": new_links, "changed": changed_links, "vanished": vanished_links}
+
+
+def main():
+    # Введення запиту
+    search_vacancy = input("🔍 Введіть назву вакансії: ").strip().lower()
+    search_city = input("🌆 Введіть місто: ").strip().lower()
+    page_input = input("📄 Введіть кількість сторінок для обробки (або 'всі'): ").strip().lower()
+
+    # Валідація введення
+    if not search_vacancy or not search_city:
+        print("❌ Помилка: вакансія та місто не можуть бути порожніми!")
+        exit(1)
 
+    if pa is None and any(path and path.endswith(COLUMNAR_EXTENSIONS) for path in (OUTPUT_FILE, COLUMNAR_FILE)):
+        print("❌ Помилка: для експорту в Parquet/Arrow потрібен pyarrow (pip install pyarrow)")
+        exit(1)
 
-jobs.sort(key=lambda x: parse_salary(x[2]), reverse=True)
+    max_pages = None
+    if page_input != "всі":
+        try:
+            max_pages = int(page_input)
+            if max_pages < 1:
+                print("❌ Помилка: кількість сторінок має бути більше 0!")
+                exit(1)
+        except ValueError:
+            print("❌ Помилка: введіть число або 'всі'!")
+            exit(1)
 
-# Збереження у CSV
-if jobs:
-    with open("workua_jobs.csv", "w", newline="", encoding="UTF-8") as file:
-        writer = csv.writer(file)
-        writer.writerow(["Назва вакансії", "Компанія", "Зарплата", "Місто", "Час публікації", "Посилання"])
-        writer.writerows(jobs)
-    print("✅ Вакансії збережено в workua_jobs.csv")
-    logging.info("Вакансії збережено в workua_jobs.csv")
-else:
-    print("❌ Не знайдено жодної вакансії для збереження.")
-    logging.warning("Не знайдено жодної вакансії")
+    # HTTP-завантажувач; Firefox запускається лише як резервний варіант
+    cache = HttpCache(HTTP_CACHE_DIR, HTTP_CACHE_TTL, HTTP_CACHE_MAX_MB * 2 ** 20) if HTTP_CACHE_DIR else None
+    try:
+        with ListingFetcher(rate_limiter=create_rate_limiter(), max_per_host=CONCURRENCY, cache=cache,
+                            headless=BROWSER_HEADLESS) as fetcher:
+            run_query(fetcher, search_vacancy, search_city, max_pages)
+    except PageError as e:
+        print(f"❌ {e}: немає ні вакансій, ні повідомлення про їх відсутність. Спробуйте пізніше.")
+        logging.error(f"{e}; кількість сторінок не визначено, прогрес не збережено")
+    finally:
+        if cache is not None:
+            cache.close()
+
+    if METRICS_FILE:
+        METRICS.write(METRICS_FILE)
+        print(f"📈 Метрики запуску збережено в {METRICS_FILE}")
+        logging.info(f"Метрики запуску збережено в {METRICS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Пакетний режим: багато запитів (вакансія, місто) в одному процесі.
+
+Запити виконуються паралельно і беруть завантажувачі зі спільного обмеженого пулу,
+тому HTTP-сесії (і браузер, якщо знадобився резервний варіант) створюються один раз
+на весь пакет, а не для кожного запиту. Частота запитів до work.ua обмежується одним
+спільним AdaptiveRateLimiter.
+
+Файл запитів: по одному запиту на рядок у форматі "вакансія;місто[;сторінки]",
+порожні рядки та рядки з # пропускаються. Кількість сторінок — число або "всі".
+
+Використання:
+    python workua_batch.py --queries queries.txt --workers 4 --merged workua_jobs_all.csv
+    python workua_batch.py -v водій -v кухар -c київ -c львів --pages 3
+"""
+import argparse
+import heapq
+import logging
+import os
+import queue
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import work_scrap
+from work_scrap import parse_published_date, parse_salary, parse_salary_range, run_query
+from workua_cache import HttpCache
+from workua_fetch import HostLimiter, ListingFetcher
+from workua_metrics import METRICS
+from workua_pipeline import COLUMNAR_EXTENSIONS, open_sink, pa, read_records
+
+
+class FetcherPool:
+    """Обмежений пул завантажувачів, які повторно використовуються різними запитами."""
+
+    def __init__(self, size, rate_limiter=None, max_per_host=4, cache=None, headless=True):
+        """
+        Args:
+            size (int): Кількість завантажувачів у пулі.
+            rate_limiter (TokenBucket): Спільний обмежувач частоти запитів.
+            max_per_host (int): Максимальна кількість одночасних запитів до одного хоста від усіх завантажувачів пулу.
+            cache (HttpCache): Спільний дисковий кеш сторінок.
+            headless (bool): Запускати резервний Firefox без вікна.
+        """
+        host_limiter = HostLimiter(max_per_host)
+        self.fetchers = [ListingFetcher(rate_limiter=rate_limiter, max_per_host=max_per_host, cache=cache,
+                                        headless=headless, host_limiter=host_limiter)
+                         for _ in range(size)]
+        self.idle = queue.Queue()
+        for fetcher in self.fetchers:
+            self.idle.put(fetcher)
+
+    @contextmanager
+    def acquire(self):
+        """Видає вільний завантажувач на час виконання запиту (чекає, якщо всі зайняті)."""
+        fetcher = self.idle.get()
+        try:
+            yield fetcher
+        finally:
+            self.idle.put(fetcher)
+
+    def close(self):
+        for fetcher in self.fetchers:
+            fetcher.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def parse_pages(value):
+    """
+    Перетворює кількість сторінок із тексту.
+
+    Args:
+        value (str): Число або "всі".
+
+    Returns:
+        int: Кількість сторінок або None для "всі".
+    """
+    value = value.strip().lower()
+    if value in ("", "всі"):
+        return None
+    pages = int(value)
+    if pages < 1:
+        raise ValueError("кількість сторінок має бути більше 0")
+    return pages
+
+
+def load_queries(path, default_pages=None):
+    """
+    Читає запити з файлу.
+
+    Args:
+        path (str): Шлях до файлу запитів.
+        default_pages (int): Кількість сторінок, якщо її не вказано в рядку (None — усі).
+
+    Returns:
+        list: Трійки (вакансія, місто, кількість сторінок).
+    """
+    queries = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parts = [part.strip().lower() for part in line.split(";")]
+            if len(parts) < 2 or not parts[0] or not parts[1]:
+                raise ValueError(f"{path}:{line_no}: очікується 'вакансія;місто[;сторінки]'")
+            pages = parse_pages(parts[2]) if len(parts) > 2 else default_pages
+            queries.append((parts[0], parts[1], pages))
+    return queries
+
+
+def query_slug(vacancy, city):
+    """Формує частину імені файлу для запиту (наприклад, "київ-водій-автобуса")."""
+    return "-".join(city.split() + vacancy.split())
+
+
+def merge_outputs(paths, merged_file):
+    """
+    Зливає відсортовані за зарплатою файли запитів в один, прибираючи дублікати за посиланням.
+    Кожен файл уже відсортований, тому злиття потокове (heapq.merge) і не тримає записи в пам'яті.
+
+    Args:
+        paths (list): Файли результатів окремих запитів.
+        merged_file (str): Підсумковий файл (.csv, .jsonl або .parquet/.arrow з типізованими колонками).
+
+    Returns:
+        int: Кількість записів у підсумковому файлі.
+    """
+    seen = set()
+    fields = work_scrap.output_fields()
+    streams = [read_records(path, fields) for path in paths]
+    with open_sink(merged_file, fields, salary_key=parse_salary_range, date_key=parse_published_date) as sink:
+        for record in heapq.merge(*streams, key=lambda x: parse_salary(x["salary"]), reverse=True):
+            if record["link"] in seen:
+                continue
+            seen.add(record["link"])
+            sink.write(record)
+    return sink.count
+
+
+def run_batch(queries, workers=4, output_dir="batch_output", output_format="csv", columnar_format=None):
+    """
+    Виконує запити паралельно зі спільним пулом завантажувачів.
+
+    Args:
+        queries (list): Трійки (вакансія, місто, кількість сторінок або None).
+        workers (int): Кількість запитів, що виконуються одночасно (і розмір пулу завантажувачів).
+        output_dir (str): Каталог для файлів окремих запитів.
+        output_format (str): "csv" або "jsonl".
+        columnar_format (str): "parquet" або "arrow" — додатковий типізований файл для кожного запиту (None — ні).
+
+    Returns:
+        list: Підсумки запитів (див. work_scrap.run_query); для запиту з помилкою — з ключем "error".
+              Повторний запит з тими самими вакансією й містом виконується лише раз (з першою кількістю сторінок).
+    """
+    # Однаковий запит, заданий двічі (наприклад, у --queries і через -v/-c), виконувався б
+    # одночасно над тими самими файлами й контрольною точкою
+    unique = {}
+    for vacancy, city, max_pages in queries:
+        unique.setdefault((vacancy, city), (vacancy, city, max_pages))
+    queries = list(unique.values())
+
+    os.makedirs(output_dir, exist_ok=True)
+    rate_limiter = work_scrap.create_rate_limiter()
+    cache = None
+    if work_scrap.HTTP_CACHE_DIR:
+        cache = HttpCache(work_scrap.HTTP_CACHE_DIR, work_scrap.HTTP_CACHE_TTL, work_scrap.HTTP_CACHE_MAX_MB * 2 ** 20)
+
+    with FetcherPool(workers, rate_limiter, max_per_host=work_scrap.CONCURRENCY, cache=cache,
+                     headless=work_scrap.BROWSER_HEADLESS) as pool:
+        def run_one(query):
+            vacancy, city, max_pages = query
+            slug = query_slug(vacancy, city)
+            output_file = os.path.join(output_dir, f"workua_jobs_{slug}.{output_format}")
+            stream_file = os.path.join(output_dir, f"workua_jobs_{slug}.stream.jsonl")
+            columnar_file = None
+            if columnar_format:
+                columnar_file = os.path.join(output_dir, f"workua_jobs_{slug}.{columnar_format}")
+            try:
+                with pool.acquire() as fetcher:
+                    return run_query(fetcher, vacancy, city, max_pages, output_file=output_file,
+                                     stream_file=stream_file, columnar_file=columnar_file)
+            except Exception as e:
+                logging.error(f"Запит {vacancy} / {city} завершився помилкою: {str(e)}")
+                print(f"❌ Запит {vacancy} / {city} завершився помилкою: {e}")
+                return {"vacancy": vacancy, "city": city, "records": 0, "output": None, "error": str(e)}
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(run_one, queries))
+        finally:
+            if cache is not None:
+                cache.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетний парсинг вакансій work.ua")
+    parser.add_argument("--queries", help="файл запитів 'вакансія;місто[;сторінки]'")
+    parser.add_argument("-q", "--query", action="append", default=[], help="запит 'вакансія;місто[;сторінки]'")
+    parser.add_argument("-v", "--vacancy", action="append", default=[], help="вакансія (комбінується з усіма --city)")
+    parser.add_argument("-c", "--city", action="append", default=[], help="місто (комбінується з усіма --vacancy)")
+    parser.add_argument("--pages", default="всі", help="кількість сторінок за замовчуванням (число або 'всі')")
+    parser.add_argument("--workers", type=int, default=4, help="кількість запитів, що виконуються одночасно")
+    parser.add_argument("--output-dir", default="batch_output", help="каталог для файлів окремих запитів")
+    parser.add_argument("--format", choices=("csv", "jsonl"), default="csv", help="формат файлів запитів")
+    parser.add_argument("--columnar", choices=("parquet", "arrow"),
+                        help="також писати типізований файл Parquet/Arrow для кожного запиту")
+    parser.add_argument("--merged", help="зібрати всі результати в один файл (.csv або .jsonl)")
+    parser.add_argument("--merged-only", action="store_true", help="видалити файли окремих запитів після злиття")
+    parser.add_argument("--enrich", action="store_true",
+                        help="доповнити записи описом, типом зайнятості й точною зарплатою зі сторінок вакансій")
+    parser.add_argument("--metrics", default=work_scrap.METRICS_FILE,
+                        help="файл метрик усього пакета (.json або .prom для Prometheus)")
+    args = parser.parse_args()
+
+    try:
+        default_pages = parse_pages(args.pages)
+        queries = load_queries(args.queries, default_pages) if args.queries else []
+        for line in args.query:
+            parts = [part.strip().lower() for part in line.split(";")]
+            if len(parts) < 2 or not parts[0] or not parts[1]:
+                raise ValueError(f"запит '{line}': очікується 'вакансія;місто[;сторінки]'")
+            queries.append((parts[0], parts[1], parse_pages(parts[2]) if len(parts) > 2 else default_pages))
+    except (OSError, ValueError) as e:
+        print(f"❌ Помилка: {e}")
+        sys.exit(1)
+    queries += [(vacancy.strip().lower(), city.strip().lower(), default_pages)
+                for vacancy in args.vacancy for city in args.city]
+    if not queries:
+        print("❌ Помилка: не задано жодного запиту (--queries, --query або --vacancy разом із --city)")
+        sys.exit(1)
+
+    if args.enrich:
+        work_scrap.ENRICH_DETAILS = True
+
+    # Перевіряємо до запуску, а не після години парсингу
+    if pa is None and (args.columnar or (args.merged and args.merged.endswith(COLUMNAR_EXTENSIONS))):
+        print("❌ Помилка: для --columnar і --merged у Parquet/Arrow потрібен pyarrow (pip install pyarrow)")
+        sys.exit(1)
+
+    print(f"🚀 Запитів: {len(queries)}, одночасно: {args.workers}")
+    logging.info(f"Пакетний запуск: запитів={len(queries)}, одночасно={args.workers}")
+
+    results = run_batch(queries, workers=args.workers, output_dir=args.output_dir, output_format=args.format,
+                        columnar_format=args.columnar)
+
+    print("\n📋 Підсумок:")
+    for result in results:
+        status = f"помилка: {result['error']}" if "error" in result else f"{result['records']} вакансій"
+        print(f"  {result['vacancy']} / {result['city']}: {status}")
+
+    if args.merged:
+        outputs = [result["output"] for result in results if result["output"]]
+        count = merge_outputs(outputs, args.merged)
+        print(f"✅ Об'єднано {count} унікальних вакансій у {args.merged}")
+        logging.info(f"Об'єднано {count} вакансій у {args.merged}")
+        if args.merged_only:
+            for path in outputs:
+                os.remove(path)
+
+    if args.metrics:
+        METRICS.write(args.metrics)
+        print(f"📈 Метрики пакета збережено в {args.metrics}")
+
+    if any("error" in result for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
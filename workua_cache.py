@@ -0,0 +1,224 @@
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Збільшити після змін у парсері: записи, розібрані старою версією, перестануть використовуватись
+RECORDS_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS records (
+    digest TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (digest, version)
+);
+"""
+
+
+def page_digest(html):
+    """
+    Обчислює хеш вмісту сторінки, за яким кешуються розібрані записи.
+
+    Args:
+        html (str): HTML сторінки.
+
+    Returns:
+        str: SHA-1 у шістнадцятковому вигляді.
+    """
+    return hashlib.sha1(html.encode("utf-8")).hexdigest()
+
+
+class HttpCache:
+    """
+    Дисковий кеш сторінок зі списком вакансій: тіла відповідей у gzip (як page_N.html.gz),
+    ETag/Last-Modified для умовних запитів, TTL, витіснення найдавніше використаних
+    сторінок понад ліміт розміру, а також розібрані записи для кожного хешу сторінки.
+    Записи зберігаються лише для сторінок, що є в кеші, видаляються разом із ними
+    та враховуються в ліміті розміру.
+    """
+
+    def __init__(self, directory, ttl=600, max_bytes=200 * 2 ** 20):
+        """
+        Args:
+            directory (str): Каталог кешу (створюється за потреби).
+            ttl (float): Скільки секунд сторінка вважається свіжою і повертається без запиту.
+            max_bytes (int): Максимальний сумарний розмір стиснених тіл і розібраних записів.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        # Кеш використовують потоки завантаження, тому одне з'єднання під замком
+        self.conn = sqlite3.connect(os.path.join(directory, "index.sqlite3"), timeout=30, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        with self.conn:
+            # Записи старих версій парсера та сторінок, яких уже немає в кеші, більше не знадобляться
+            self.conn.execute("DELETE FROM records WHERE version != ? OR digest NOT IN (SELECT digest FROM entries)",
+                              (RECORDS_VERSION,))
+        self.total_size = (self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                           + self.conn.execute("SELECT COALESCE(SUM(LENGTH(CAST(data AS BLOB))), 0) FROM records")
+                           .fetchone()[0])
+
+    def lookup(self, url):
+        """
+        Повертає збережену сторінку для URL.
+
+        Args:
+            url (str): URL сторінки.
+
+        Returns:
+            dict: html, etag, last_modified, fresh (True, якщо TTL ще не минув) або None.
+        """
+        with self.lock:
+            row = self.conn.execute("SELECT filename, etag, last_modified, fetched_at FROM entries WHERE url = ?",
+                                    (url,)).fetchone()
+            if row is None:
+                return None
+            filename, etag, last_modified, fetched_at = row
+            try:
+                with gzip.open(os.path.join(self.directory, filename), "rt", encoding="utf-8") as f:
+                    html = f.read()
+            except (OSError, EOFError):
+                # Файл видалено або пошкоджено — вважаємо, що сторінки в кеші немає
+                self._delete(url, filename)
+                return None
+            with self.conn:
+                self.conn.execute("UPDATE entries SET accessed_at = ? WHERE url = ?", (time.time(), url))
+        return {"html": html, "etag": etag, "last_modified": last_modified,
+                "fresh": time.time() - fetched_at < self.ttl}
+
+    def store(self, url, html, etag=None, last_modified=None):
+        """
+        Зберігає нову версію сторінки і витісняє найдавніше використані, якщо кеш переповнено.
+
+        Args:
+            url (str): URL сторінки.
+            html (str): HTML сторінки.
+            etag (str): Заголовок ETag відповіді.
+            last_modified (str): Заголовок Last-Modified відповіді.
+        """
+        filename = hashlib.sha1(url.encode("utf-8")).hexdigest() + ".html.gz"
+        body = gzip.compress(html.encode("utf-8"), mtime=0)
+        now = time.time()
+        with self.lock:
+            path = os.path.join(self.directory, filename)
+            with open(path + ".tmp", "wb") as f:
+                f.write(body)
+            os.replace(path + ".tmp", path)
+            row = self.conn.execute("SELECT size, digest FROM entries WHERE url = ?", (url,)).fetchone()
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO entries (url, filename, digest, etag, last_modified, size, fetched_at, "
+                    "accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (url, filename, page_digest(html), etag, last_modified, len(body), now, now))
+            self.total_size += len(body) - (row[0] if row else 0)
+            if row:
+                # Записи попередньої версії сторінки більше не потрібні
+                self._drop_records(row[1])
+            self._evict()
+
+    def refresh(self, url, etag=None, last_modified=None):
+        """
+        Позначає сторінку знову свіжою після відповіді 304 Not Modified.
+
+        Args:
+            url (str): URL сторінки.
+            etag (str): Новий ETag, якщо сервер його надіслав.
+            last_modified (str): Новий Last-Modified, якщо сервер його надіслав.
+        """
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE entries SET fetched_at = ?, accessed_at = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                (now, now, etag, last_modified, url))
+
+    def get_records(self, digest):
+        """
+        Повертає записи, раніше розібрані зі сторінки з таким хешем.
+
+        Args:
+            digest (str): Хеш сторінки (page_digest).
+
+        Returns:
+            list: Записи (None для карток, які не вдалося обробити) або None, якщо їх немає в кеші.
+        """
+        with self.lock:
+            row = self.conn.execute("SELECT data FROM records WHERE digest = ? AND version = ?",
+                                    (digest, RECORDS_VERSION)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_records(self, digest, records):
+        """
+        Зберігає розібрані записи сторінки, якщо сама сторінка є в кеші (записи сторінок
+        з браузера чи без карток не зберігаються: їх ніщо не видалило б).
+
+        Args:
+            digest (str): Хеш сторінки (page_digest).
+            records (list): Записи сторінки.
+        """
+        data = json.dumps(records, ensure_ascii=False)
+        with self.lock:
+            if self.conn.execute("SELECT 1 FROM entries WHERE digest = ?", (digest,)).fetchone() is None:
+                return
+            row = self.conn.execute("SELECT LENGTH(CAST(data AS BLOB)) FROM records WHERE digest = ? AND version = ?",
+                                    (digest, RECORDS_VERSION)).fetchone()
+            with self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO records (digest, version, data) VALUES (?, ?, ?)",
+                                  (digest, RECORDS_VERSION, data))
+            self.total_size += len(data.encode("utf-8")) - (row[0] if row else 0)
+            self._evict()
+
+    def _drop_records(self, digest):
+        """Видаляє записи хешу, якщо жодна сторінка в кеші вже не має такого вмісту."""
+        if self.conn.execute("SELECT 1 FROM entries WHERE digest = ?", (digest,)).fetchone() is not None:
+            return
+        size = self.conn.execute("SELECT COALESCE(SUM(LENGTH(CAST(data AS BLOB))), 0) FROM records WHERE digest = ?",
+                                 (digest,)).fetchone()[0]
+        with self.conn:
+            self.conn.execute("DELETE FROM records WHERE digest = ?", (digest,))
+        self.total_size -= size
+
+    def _delete(self, url, filename):
+        path = os.path.join(self.directory, filename)
+        if os.path.exists(path):
+            os.remove(path)
+        row = self.conn.execute("SELECT size, digest FROM entries WHERE url = ?", (url,)).fetchone()
+        with self.conn:
+            self.conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+        if row:
+            self.total_size -= row[0]
+            self._drop_records(row[1])
+
+    def _evict(self):
+        if self.total_size <= self.max_bytes:
+            return
+        for url, filename in self.conn.execute("SELECT url, filename FROM entries ORDER BY accessed_at").fetchall():
+            if self.total_size <= self.max_bytes:
+                break
+            self._delete(url, filename)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
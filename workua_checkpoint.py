@@ -0,0 +1,179 @@
+import json
+import sqlite3
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS queries (
+    vacancy TEXT NOT NULL,
+    city TEXT NOT NULL,
+    max_pages INTEGER NOT NULL,
+    started_at TEXT NOT NULL,
+    PRIMARY KEY (vacancy, city)
+);
+CREATE TABLE IF NOT EXISTS pages (
+    vacancy TEXT NOT NULL,
+    city TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    completed_at TEXT NOT NULL,
+    PRIMARY KEY (vacancy, city, page)
+);
+CREATE TABLE IF NOT EXISTS records (
+    vacancy TEXT NOT NULL,
+    city TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (vacancy, city, page, seq)
+);
+"""
+
+
+class CheckpointStore:
+    """
+    Зберігає прогрес парсингу в SQLite: оброблені сторінки та знайдені на них записи
+    для кожного запиту (вакансія, місто). Повторний запуск продовжує роботу з першої
+    незавершеної сторінки замість сторінки 1.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Шлях до файлу бази SQLite (створюється за потреби).
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.executescript(SCHEMA)
+
+    def get_max_pages(self, vacancy, city):
+        """
+        Повертає кількість сторінок незавершеного запиту.
+
+        Args:
+            vacancy (str): Назва вакансії.
+            city (str): Місто.
+
+        Returns:
+            int: Кількість сторінок або None, якщо збереженого прогресу немає.
+        """
+        row = self.conn.execute("SELECT max_pages FROM queries WHERE vacancy = ? AND city = ?",
+                                (vacancy, city)).fetchone()
+        return row[0] if row else None
+
+    def discard_stale(self, vacancy, city, max_age):
+        """
+        Видаляє прогрес запиту, розпочатого давніше ніж max_age секунд тому:
+        записи зі старих сторінок уже не відповідають сайту.
+
+        Args:
+            vacancy (str): Назва вакансії.
+            city (str): Місто.
+            max_age (float): Максимальний вік прогресу в секундах.
+
+        Returns:
+            bool: True, якщо прогрес був і його видалено.
+        """
+        row = self.conn.execute("SELECT started_at FROM queries WHERE vacancy = ? AND city = ?",
+                                (vacancy, city)).fetchone()
+        if row is None or (datetime.now() - datetime.fromisoformat(row[0])).total_seconds() <= max_age:
+            return False
+        self.clear(vacancy, city)
+        return True
+
+    def begin(self, vacancy, city, max_pages):
+        """
+        Реєструє запит (або оновлює кількість сторінок для вже розпочатого).
+        Збережені сторінки понад max_pages видаляються, щоб не потрапити в результат.
+
+        Args:
+            vacancy (str): Назва вакансії.
+            city (str): Місто.
+            max_pages (int): Кількість сторінок для обробки.
+        """
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO queries (vacancy, city, max_pages, started_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (vacancy, city) DO UPDATE SET max_pages = excluded.max_pages",
+                (vacancy, city, max_pages, datetime.now().isoformat(timespec="seconds")))
+            for table in ("records", "pages"):
+                self.conn.execute(f"DELETE FROM {table} WHERE vacancy = ? AND city = ? AND page > ?",
+                                  (vacancy, city, max_pages))
+
+    def next_page(self, vacancy, city, first_page=1):
+        """
+        Визначає першу незавершену сторінку запиту.
+
+        Args:
+            vacancy (str): Назва вакансії.
+            city (str): Місто.
+            first_page (int): Перша сторінка діапазону (для частини запиту, див. workua_shards).
+
+        Returns:
+            int: Номер сторінки, з якої слід продовжити (first_page, якщо прогресу немає).
+        """
+        done = {row[0] for row in self.conn.execute(
+            "SELECT page FROM pages WHERE vacancy = ? AND city = ?", (vacancy, city))}
+        page = first_page
+        while page in done:
+            page += 1
+        return page
+
+    def save_page(self, vacancy, city, page, records):
+        """
+        Атомарно позначає сторінку обробленою разом із її записами.
+
+        Args:
+            vacancy (str): Назва вакансії.
+            city (str): Місто.
+            page (int): Номер сторінки.
+            records (list): Записи вакансій, знайдені на сторінці.
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM records WHERE vacancy = ? AND city = ? AND page = ?",
+                              (vacancy, city, page))
+            self.conn.executemany(
+                "INSERT INTO records (vacancy, city, page, seq, data) VALUES (?, ?, ?, ?, ?)",
+                [(vacancy, city, page, seq, json.dumps(record, ensure_ascii=False))
+                 for seq, record in enumerate(records)])
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (vacancy, city, page, completed_at) VALUES (?, ?, ?, ?)",
+                (vacancy, city, page, datetime.now().isoformat(timespec="seconds")))
+
+    def pages(self, vacancy, city):
+        """
+        Повертає збережені сторінки запиту з їхніми записами в порядку номерів.
+
+        Args:
+            vacancy (str): Назва вакансії.
+            city (str): Місто.
+
+        Yields:
+            tuple: (номер сторінки, список записів вакансій).
+        """
+        done = [row[0] for row in self.conn.execute(
+            "SELECT page FROM pages WHERE vacancy = ? AND city = ? ORDER BY page", (vacancy, city))]
+        for page in done:
+            cursor = self.conn.execute(
+                "SELECT data FROM records WHERE vacancy = ? AND city = ? AND page = ? ORDER BY seq",
+                (vacancy, city, page))
+            yield page, [json.loads(data) for (data,) in cursor]
+
+    def clear(self, vacancy, city):
+        """
+        Видаляє прогрес запиту після успішного завершення, щоб наступний запуск почався спочатку.
+
+        Args:
+            vacancy (str): Назва вакансії.
+            city (str): Місто.
+        """
+        with self.conn:
+            for table in ("records", "pages", "queries"):
+                self.conn.execute(f"DELETE FROM {table} WHERE vacancy = ? AND city = ?", (vacancy, city))
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
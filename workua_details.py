@@ -0,0 +1,187 @@
+import logging
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+import workua_fetch
+from workua_metrics import METRICS
+from workua_parser import DEFAULT_BACKEND
+from workua_pipeline import DETAIL_FIELDS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS details (
+    link TEXT PRIMARY KEY,
+    description TEXT,
+    employment_type TEXT,
+    salary_exact TEXT,
+    fetched_at TEXT NOT NULL
+);
+"""
+
+EMPLOYMENT_RE = re.compile(r"[^.,;]*зайнятість[^.,;]*", re.IGNORECASE)
+
+
+def detail_url(link):
+    """
+    Формує URL сторінки вакансії на поточному BASE_URL (посилання в записах завжди на www.work.ua).
+
+    Args:
+        link (str): Посилання з запису вакансії.
+
+    Returns:
+        str: URL для завантаження.
+    """
+    return workua_fetch.BASE_URL + urlparse(link).path
+
+
+def parse_detail(html):
+    """
+    Витягує додаткові поля зі сторінки вакансії.
+
+    Args:
+        html (str): HTML сторінки вакансії.
+
+    Returns:
+        dict: description (повний опис), employment_type (наприклад, "Повна зайнятість"),
+              salary_exact (зарплата у форматі поля salary, наприклад "25000–30000"); "Не вказано", якщо поля немає.
+    """
+    soup = BeautifulSoup(html, DEFAULT_BACKEND)
+    details = {field: "Не вказано" for field in DETAIL_FIELDS}
+
+    description = soup.find(id="job-description")
+    if description is not None:
+        details["description"] = description.get_text("\n", strip=True)
+
+    conditions = soup.find("li", title="Умови й вимоги")
+    if conditions is not None:
+        employment = EMPLOYMENT_RE.search(conditions.get_text(" ", strip=True))
+        if employment:
+            details["employment_type"] = employment.group(0).strip()
+
+    salary = soup.find("li", title="Зарплата")
+    if salary is not None:
+        salary_tag = salary.find("span", class_="strong-500") or salary
+        # Та сама нормалізація, що й для зарплати з картки (див. workua_parser.extract_card)
+        details["salary_exact"] = salary_tag.get_text().strip().replace(" ", "").replace(" ", "") \
+            .replace("грн", "").replace(" ", "")
+    return details
+
+
+class DetailStore:
+    """Зберігає поля сторінок вакансій між запусками, щоб не завантажувати їх повторно."""
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Шлях до файлу бази SQLite (створюється за потреби).
+        """
+        # Записи додаються з потоку конвеєра, а читання — з того самого потоку, тож замок не потрібен
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.executescript(SCHEMA)
+
+    def get_many(self, links):
+        """
+        Повертає вже збережені поля для посилань.
+
+        Args:
+            links (list): Посилання вакансій.
+
+        Returns:
+            dict: {посилання: поля} для знайдених посилань.
+        """
+        found = {}
+        for link in links:
+            row = self.conn.execute(f"SELECT {', '.join(DETAIL_FIELDS)} FROM details WHERE link = ?",
+                                    (link,)).fetchone()
+            if row:
+                found[link] = dict(zip(DETAIL_FIELDS, row))
+        return found
+
+    def put(self, link, details):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO details (link, description, employment_type, salary_exact, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (link, details["description"], details["employment_type"], details["salary_exact"],
+                 datetime.now().isoformat(timespec="seconds")))
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class DetailEnricher:
+    """
+    Доповнює записи сторінки полями зі сторінок вакансій. Сторінки, яких ще немає в DetailStore,
+    завантажуються паралельно (не більше workers одночасно) через той самий ListingFetcher,
+    тож діють спільні обмеження частоти та кількості з'єднань.
+    """
+
+    def __init__(self, fetcher, store, workers=4):
+        """
+        Args:
+            fetcher (ListingFetcher): Завантажувач сторінок.
+            store (DetailStore): Сховище вже отриманих полів.
+            workers (int): Кількість сторінок вакансій, що завантажуються одночасно.
+        """
+        self.fetcher = fetcher
+        self.store = store
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers))
+
+    def _fetch(self, link):
+        html = self.fetcher.fetch_http(detail_url(link))
+        if not html:
+            return None
+        with METRICS.timer("enrich_parse"):
+            return parse_detail(html)
+
+    def enrich(self, records):
+        """
+        Додає до записів поля DETAIL_FIELDS.
+
+        Args:
+            records (list): Записи вакансій сторінки.
+
+        Returns:
+            list: Ті самі записи з полями description, employment_type, salary_exact
+                  ("Не вказано", якщо сторінку вакансії не вдалося завантажити).
+        """
+        links = [record["link"] for record in records if record["link"].startswith("http")]
+        known = self.store.get_many(links)
+        METRICS.inc("details_cached_total", len(known))
+        futures = {link: self.executor.submit(self._fetch, link) for link in dict.fromkeys(links) if link not in known}
+        for link, future in futures.items():
+            try:
+                details = future.result()
+            except Exception as e:
+                logging.warning(f"Не вдалося обробити сторінку вакансії {link}: {str(e)}")
+                details = None
+            if details is None:
+                METRICS.inc("details_failed_total")
+                continue
+            METRICS.inc("details_fetched_total")
+            self.store.put(link, details)
+            known[link] = details
+
+        missing = {field: "Не вказано" for field in DETAIL_FIELDS}
+        for record in records:
+            record.update(known.get(record["link"], missing))
+        return records
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
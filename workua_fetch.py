@@ -0,0 +1,496 @@
+import logging
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selenium import webdriver
+from selenium.webdriver.firefox.service import Service
+from selenium.webdriver.firefox.options import Options
+
+from workua_metrics import METRICS
+
+BASE_URL = "https://www.work.ua"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:129.0) Gecko/20100101 Firefox/129.0"
+
+# Картки вакансій присутні у серверному HTML як <div class="... job-link ...">
+JOB_LINK_RE = re.compile(r"""class=["'][^"']*\bjob-link\b""")
+
+# Повідомлення work.ua про відсутність вакансій (звичайний кінець результатів, а не помилка)
+NO_RESULTS_RE = re.compile("Немає результатів|Вакансії не знайдені")
+
+# Чекає в браузері, доки PJAX-вміст сторінки не стане готовим: повертає кількість карток одразу,
+# щойно з'явиться хоча б одна, або після того, як DOM завантаженої сторінки не змінюється quiet мс
+# (сторінка без вакансій). arguments: тайм-аут (мс), тиша (мс), колбек execute_async_script.
+READY_SCRIPT = """
+var timeout = arguments[0], quiet = arguments[1], done = arguments[arguments.length - 1];
+var count = function () { return document.getElementsByClassName("job-link").length; };
+if (count()) { done(count()); return; }
+var quietTimer, hardTimer, observer;
+var finish = function () {
+    observer.disconnect(); clearTimeout(quietTimer); clearTimeout(hardTimer); done(count());
+};
+var armQuiet = function () {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(function () {
+        if (document.readyState === "complete") { finish(); } else { armQuiet(); }
+    }, quiet);
+};
+observer = new MutationObserver(function () {
+    if (count()) { finish(); } else { armQuiet(); }
+});
+observer.observe(document.getElementById("pjax") || document.documentElement, {childList: true, subtree: true});
+armQuiet();
+hardTimer = setTimeout(finish, timeout);
+"""
+
+
+def build_listing_url(search_city, search_vacancy, page=1):
+    """
+    Формує URL сторінки зі списком вакансій work.ua.
+
+    Args:
+        search_city (str): Місто (наприклад, "київ").
+        search_vacancy (str): Назва вакансії (наприклад, "водій").
+        page (int): Номер сторінки (1 — без параметра page).
+
+    Returns:
+        str: URL сторінки (наприклад, "https://www.work.ua/jobs-київ-водій/?page=2").
+    """
+    search_query = "-".join(search_vacancy.split())
+    search_city_query = "-".join(search_city.split())
+    url = f"{BASE_URL}/jobs-{search_city_query}-{search_query}/"
+    if page > 1:
+        url += f"?page={page}"
+    return url
+
+
+def has_job_cards(html):
+    """
+    Швидко перевіряє, чи містить HTML картки вакансій (div.job-link), без повного парсингу.
+
+    Args:
+        html (str): HTML сторінки.
+
+    Returns:
+        bool: True, якщо на сторінці є хоча б одна картка.
+    """
+    return bool(html) and JOB_LINK_RE.search(html) is not None
+
+
+def create_session(pool_size=10, retries=3):
+    """
+    Створює requests.Session з пулом з'єднань і повторними спробами для 429/5xx.
+
+    Args:
+        pool_size (int): Максимальна кількість з'єднань у пулі для одного хоста.
+        retries (int): Кількість повторних спроб при помилках мережі або сервера.
+
+    Returns:
+        requests.Session: Налаштована сесія.
+    """
+    session = requests.Session()
+    retry = Retry(total=retries, backoff_factor=0.5,
+                  status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=("GET", "HEAD"))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "uk-UA,uk;q=0.9,en;q=0.5",
+    })
+    return session
+
+
+def create_driver(headless=True):
+    """
+    Запускає Firefox через Selenium (використовується лише як резервний варіант).
+    Зображення, стилі та шрифти не завантажуються: для карток потрібен лише DOM.
+
+    Args:
+        headless (bool): Запускати без вікна (False — для налагодження).
+
+    Returns:
+        webdriver.Firefox: Драйвер браузера.
+    """
+    firefox_options = Options()
+    if headless:
+        firefox_options.add_argument("--headless")
+    firefox_options.add_argument("--no-sandbox")
+    firefox_options.add_argument("--disable-dev-shm-usage")
+    # get() повертається після DOMContentLoaded, готовність карток перевіряє wait_for_listing
+    firefox_options.page_load_strategy = "eager"
+
+    # Імітація поведінки браузера
+    firefox_options.set_preference("general.useragent.override", USER_AGENT)
+
+    # Не завантажувати зображення, CSS та веб-шрифти
+    firefox_options.set_preference("permissions.default.image", 2)
+    firefox_options.set_preference("permissions.default.stylesheet", 2)
+    firefox_options.set_preference("browser.display.use_document_fonts", 0)
+    firefox_options.set_preference("gfx.downloadable_fonts.enabled", False)
+
+    service = Service()
+    return webdriver.Firefox(service=service, options=firefox_options)
+
+
+def wait_for_listing(driver, timeout=10, quiet=0.5):
+    """
+    Чекає, доки сторінка в браузері буде готова, без фіксованих пауз: повертається, щойно
+    з'являться картки job-link (MutationObserver на #pjax), або коли завантажена сторінка
+    не змінюється quiet секунд.
+
+    Args:
+        driver (webdriver.Firefox): Драйвер браузера.
+        timeout (float): Максимальний час очікування в секундах.
+        quiet (float): Скільки секунд DOM має не змінюватись, щоб вважати сторінку без карток готовою.
+
+    Returns:
+        int: Кількість карток на сторінці.
+    """
+    driver.set_script_timeout(timeout + 5)
+    return driver.execute_async_script(READY_SCRIPT, int(timeout * 1000), int(quiet * 1000))
+
+
+def observed_status(response):
+    """
+    Повертає найгірший HTTP-статус запиту з урахуванням повторних спроб urllib3
+    (429 чи 5xx, після яких сервер усе ж відповів 200, теж сигнал перевантаження).
+
+    Args:
+        response (requests.Response): Відповідь або None, якщо запит не вдався.
+
+    Returns:
+        int: Статус або None для мережевої помилки.
+    """
+    if response is None:
+        return None
+    retries = getattr(response.raw, "retries", None)
+    history = [entry.status for entry in retries.history if entry.status] if retries is not None else []
+    return max(history + [response.status_code])
+
+
+class TokenBucket:
+    """
+    Потокобезпечний обмежувач частоти запитів за алгоритмом token bucket.
+    Замінює фіксовані паузи random.uniform(1, 3) між сторінками.
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        Args:
+            rate (float): Кількість запитів за секунду в середньому.
+            capacity (float): Максимальний «запас» запитів, які можна виконати підряд.
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """
+        Блокує потік, доки в бакеті не з'явиться потрібна кількість токенів.
+
+        Args:
+            tokens (float): Кількість токенів для одного запиту.
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def record(self, status, elapsed):
+        """
+        Отримує результат запиту. Звичайний бакет частоту не змінює (див. AdaptiveRateLimiter).
+
+        Args:
+            status (int): HTTP-статус (observed_status) або None для мережевої помилки.
+            elapsed (float): Час відповіді в секундах.
+        """
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """
+    Token bucket, частота якого підлаштовується під стан сервера (AIMD): після 429/5xx
+    чи мережевої помилки вона зменшується вдвічі, після відповіді, набагато повільнішої
+    за звичайну, — на чверть, а кожна швидка успішна відповідь поступово повертає її до max_rate.
+    """
+
+    def __init__(self, rate, min_rate=None, max_rate=None, slow_factor=3.0):
+        """
+        Args:
+            rate (float): Початкова кількість запитів за секунду.
+            min_rate (float): Нижня межа частоти (за замовчуванням rate / 10).
+            max_rate (float): Верхня межа частоти (за замовчуванням rate).
+            slow_factor (float): У скільки разів відповідь має бути повільнішою за середню, щоб зменшити частоту.
+        """
+        super().__init__(rate, max(1.0, float(max_rate or rate)))
+        self.min_rate = float(min_rate or rate / 10)
+        self.max_rate = float(max_rate or rate)
+        self.step = self.max_rate / 100
+        self.slow_factor = slow_factor
+        self.latency = None  # Ковзне середнє часу відповіді
+
+    def record(self, status, elapsed):
+        with self.lock:
+            if status is None or status == 429 or status >= 500:
+                reason = "error"
+                self.rate = max(self.min_rate, self.rate / 2)
+                # Запас токенів теж скидається, щоб одразу не надіслати пачку запитів
+                self.tokens = min(self.tokens, 0.0)
+            elif self.latency is not None and elapsed > self.slow_factor * self.latency:
+                reason = "slow"
+                self.rate = max(self.min_rate, self.rate * 0.75)
+            else:
+                reason = None
+                self.rate = min(self.max_rate, self.rate + self.step)
+            if reason != "error" and elapsed is not None:
+                # Відповіді з повторними спробами (паузи Retry-After) не враховуються в середньому
+                self.latency = elapsed if self.latency is None else 0.8 * self.latency + 0.2 * elapsed
+            rate = self.rate
+        if reason is not None:
+            METRICS.inc("rate_backoffs_total", reason=reason)
+            logging.info(f"Частоту запитів знижено до {rate:.2f}/с (статус {status}, {elapsed or 0:.2f} с)")
+
+
+class HostLimiter:
+    """
+    Обмежує кількість одночасних запитів до кожного хоста. Один екземпляр можна передати
+    кільком завантажувачам, щоб обмеження діяло на них усіх разом.
+    """
+
+    def __init__(self, max_per_host=4):
+        """
+        Args:
+            max_per_host (int): Максимальна кількість одночасних запитів до одного хоста.
+        """
+        self.max_per_host = max_per_host
+        self.slots = {}
+        self.lock = threading.Lock()
+
+    def slot(self, url):
+        """Повертає семафор, що обмежує кількість одночасних запитів до хоста з URL."""
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.slots:
+                self.slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self.slots[host]
+
+
+class ListingFetcher:
+    """
+    Завантажує сторінки зі списком вакансій: спочатку через HTTP (requests.Session),
+    а Selenium-драйвер запускається лише тоді, коли у відповіді немає карток job-link.
+    """
+
+    def __init__(self, session=None, timeout=15, use_fallback=True, rate_limiter=None, max_per_host=4, cache=None,
+                 headless=True, host_limiter=None):
+        """
+        Args:
+            session (requests.Session): Готова сесія (за замовчуванням створюється нова).
+            timeout (int): Тайм-аут HTTP-запиту в секундах.
+            use_fallback (bool): Чи дозволено запускати браузер, якщо HTTP не дав карток.
+            rate_limiter (TokenBucket): Обмежувач частоти запитів (None — без обмеження);
+                AdaptiveRateLimiter отримує статус і час кожної відповіді.
+            max_per_host (int): Максимальна кількість одночасних запитів до одного хоста.
+            cache (HttpCache): Дисковий кеш сторінок (None — без кешу).
+            headless (bool): Запускати резервний Firefox без вікна.
+            host_limiter (HostLimiter): Спільне обмеження запитів до хоста (за замовчуванням власне, на max_per_host).
+        """
+        self.session = session or create_session(pool_size=max_per_host)
+        self.timeout = timeout
+        self.use_fallback = use_fallback
+        self.rate_limiter = rate_limiter
+        self.max_per_host = max_per_host
+        self.cache = cache
+        self.headless = headless
+        self.driver = None
+        self.host_limiter = host_limiter or HostLimiter(max_per_host)
+        self._browser_lock = threading.Lock()
+
+    def fetch_http(self, url):
+        """
+        Завантажує сторінку напряму через HTTP. Якщо задано кеш, свіжа сторінка береться з диска
+        без запиту, а застаріла перевіряється умовним запитом (If-None-Match / If-Modified-Since).
+
+        Args:
+            url (str): URL сторінки.
+
+        Returns:
+            str: HTML сторінки або None, якщо запит не вдався.
+        """
+        cached = self.cache.lookup(url) if self.cache is not None else None
+        if cached is not None and cached["fresh"]:
+            METRICS.inc("cache_total", result="fresh")
+            return cached["html"]
+        headers = {}
+        if cached is not None:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            wait_start = time.perf_counter()
+            with self.host_limiter.slot(url):
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire()
+                METRICS.observe("stage_seconds", time.perf_counter() - wait_start, stage="wait")
+                fetch_start = time.perf_counter()
+                response = None
+                try:
+                    with METRICS.timer("fetch"):
+                        response = self.session.get(url, timeout=self.timeout, headers=headers)
+                finally:
+                    if self.rate_limiter is not None:
+                        self.rate_limiter.record(observed_status(response), time.perf_counter() - fetch_start)
+            METRICS.inc("http_requests_total", status=response.status_code)
+            retries = getattr(response.raw, "retries", None)
+            if retries is not None and retries.history:
+                METRICS.inc("retries_total", len(retries.history))
+            response.raise_for_status()
+        except requests.RequestException as e:
+            METRICS.inc("http_errors_total")
+            logging.warning(f"HTTP-запит до {url} не вдався: {str(e)}")
+            return None
+        if response.status_code == 304 and cached is not None:
+            self.cache.refresh(url, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            METRICS.inc("cache_total", result="revalidated")
+            return cached["html"]
+        METRICS.inc("bytes_downloaded_total", len(response.content))
+        response.encoding = "utf-8"
+        html = response.text
+        # Кешуються лише сторінки з картками: сторінку-заглушку чи капчу не варто повертати повторно
+        if self.cache is not None and has_job_cards(html):
+            self.cache.store(url, html, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            METRICS.inc("cache_total", result="miss")
+        return html
+
+    def fetch_browser(self, url):
+        """
+        Завантажує сторінку через Selenium (драйвер запускається при першому виклику).
+
+        Args:
+            url (str): URL сторінки.
+
+        Returns:
+            str: HTML сторінки після рендерингу.
+        """
+        if self.driver is None:
+            logging.info("Запуск Firefox для резервного завантаження")
+            self.driver = create_driver(self.headless)
+        self.driver.get(url)
+        try:
+            if not wait_for_listing(self.driver):
+                logging.warning(f"Вакансії на {url} не знайдені у браузері")
+        except Exception as e:
+            logging.warning(f"Не вдалося дочекатися карток на {url}: {str(e)}")
+        return self.driver.page_source
+
+    def fetch(self, url):
+        """
+        Завантажує сторінку: HTTP, а за відсутності карток — браузер. Сторінка з повідомленням
+        про відсутність вакансій (кінець результатів) повертається без браузера.
+
+        Args:
+            url (str): URL сторінки.
+
+        Returns:
+            str: HTML сторінки (може бути порожнім рядком, якщо обидва способи не вдалися).
+        """
+        html = self.fetch_http(url)
+        if has_job_cards(html) or (html and NO_RESULTS_RE.search(html)):
+            return html
+        if not self.use_fallback:
+            return html or ""
+        logging.info(f"У HTTP-відповіді для {url} немає карток job-link, використовуємо браузер")
+        METRICS.inc("fallbacks_total")
+        try:
+            # Один драйвер на весь завантажувач, тому доступ до нього послідовний
+            with self._browser_lock, METRICS.timer("browser"):
+                return self.fetch_browser(url)
+        except Exception as e:
+            logging.error(f"Браузер не зміг завантажити {url}: {str(e)}")
+            return html or ""
+
+    def close(self):
+        """Закриває HTTP-сесію та браузер, якщо він запускався."""
+        self.session.close()
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def crawl_pages(fetcher, page_urls, workers=4, prefetched=None, lookahead=None):
+    """
+    Паралельно завантажує сторінки через пул потоків і повертає їх у порядку номерів.
+
+    Одночасно в роботі тримається не більше workers * 2 сторінок (разом із тією, що
+    обробляється), тому пам'ять не росте разом із кількістю сторінок. Якщо споживач
+    припиняє ітерацію (break), завдання, що ще не почалися, скасовуються.
+
+    Args:
+        fetcher (ListingFetcher): Завантажувач сторінок.
+        page_urls (iterable): Пари (номер сторінки, URL) у потрібному порядку.
+        workers (int): Кількість потоків.
+        prefetched (dict): Вже завантажені сторінки {номер: HTML}, які не треба запитувати знову.
+        lookahead (callable): Повертає, скільки сторінок тримати в роботі (перевіряється перед
+            кожним новим завданням); 1 — наступна сторінка запитується лише після обробки поточної.
+
+    Yields:
+        tuple: (номер сторінки, HTML сторінки).
+    """
+    prefetched = prefetched or {}
+    if lookahead is None:
+        def lookahead():
+            return max(1, workers) * 2
+    page_urls = iter(page_urls)
+    window = deque()
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+
+    def submit_next():
+        for page, url in page_urls:
+            if page in prefetched:
+                window.append((page, prefetched.pop(page)))
+            else:
+                window.append((page, executor.submit(fetcher.fetch, url)))
+            return True
+        return False
+
+    def fill():
+        while len(window) < lookahead() and submit_next():
+            pass
+
+    try:
+        fill()
+        while window:
+            page, item = window[0]
+            html = item if isinstance(item, str) else item.result()
+            window.popleft()
+            yield page, html
+            fill()
+    finally:
+        for _, item in window:
+            if not isinstance(item, str):
+                item.cancel()
+        executor.shutdown(wait=True)
@@ -0,0 +1,136 @@
+import re
+import unicodedata
+from bisect import bisect_right
+from functools import lru_cache
+
+# і/ї → латинська i, як і в create_vacancy_pattern
+_TRANSLATE = str.maketrans({"і": "i", "ї": "i"})
+
+# Роздільник для пакетної перевірки: жоден шаблон вакансії не може його перетнути
+_SEPARATOR = "\x00"
+
+
+def create_vacancy_pattern(search_vacancy):
+    """
+    Створює регулярний вираз для пошуку вакансій за введеним запитом.
+
+    Args:
+        search_vacancy (str): Назва вакансії для пошуку (наприклад, "Водій").
+
+    Returns:
+        str: Регулярний вираз для відповідності назви вакансії.
+    """
+    vacancy_base = search_vacancy.lower().strip()
+    vacancy_base = re.escape(vacancy_base)
+    vacancy_base = unicodedata.normalize("NFKD", vacancy_base).replace("і", "i").replace("ї", "i")
+    vacancy_pattern = rf'\b(?:{vacancy_base}(?:[-\s][а-яіїєґ]+)*(?:[,.\s]*(?:кат\.?|категорії?)\s*[A-ZА-ЯІЇЄҐ]+(?:[,\s]*[A-ZА-ЯІЇЄҐ]+)*)?(?:[,.\s\(][а-яіїєґ\s\(\)]+)?)\b'
+    return vacancy_pattern
+
+
+@lru_cache(maxsize=4096)
+def normalize_title(title):
+    """
+    Нормалізує назву вакансії так само, як create_vacancy_pattern нормалізує запит.
+    Однакові назви трапляються дуже часто, тому результат кешується.
+
+    Args:
+        title (str): Назва вакансії.
+
+    Returns:
+        str: Назва в нижньому регістрі після NFKD із заміною і/ї на латинську i.
+    """
+    return unicodedata.normalize("NFKD", title.lower()).translate(_TRANSLATE)
+
+
+class VacancyMatcher:
+    """
+    Перевіряє назви вакансій на відповідність одному або кільком запитам.
+    Регулярні вирази компілюються один раз при створенні; для повторного використання
+    між запитами екземпляри слід отримувати через get_matcher.
+    """
+
+    def __init__(self, terms):
+        """
+        Args:
+            terms (tuple): Назви вакансій (наприклад, ("водій", "водій-експедитор")).
+        """
+        self.terms = tuple(term.lower().strip() for term in terms)
+        patterns = [create_vacancy_pattern(term) for term in self.terms]
+        self.patterns = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+        # Усі запити однією альтернацією: відповідь «чи підходить хоч один» за один прохід
+        self.combined = re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+        # Кожен шаблон починається з буквальної назви, тож її відсутність одразу відкидає назву
+        self.bases = [normalize_title(term) for term in self.terms]
+        self.prefilter = re.compile("|".join(re.escape(base) for base in sorted(set(self.bases), key=len, reverse=True)),
+                                    re.IGNORECASE)
+
+    def matches(self, title):
+        """
+        Перевіряє, чи відповідає назва хоча б одному запиту.
+
+        Args:
+            title (str): Назва вакансії.
+
+        Returns:
+            bool: True, якщо назва відповідає шаблону.
+        """
+        return self.combined.search(normalize_title(title)) is not None
+
+    def matches_many(self, titles):
+        """
+        Перевіряє багато назв одним проходом регулярного виразу по об'єднаному тексту.
+
+        Args:
+            titles (list): Назви вакансій.
+
+        Returns:
+            list: Для кожної назви True, якщо вона відповідає хоча б одному запиту.
+        """
+        result = [False] * len(titles)
+        if not titles:
+            return result
+        normalized = [normalize_title(title) for title in titles]
+        starts = []
+        offset = 0
+        for text in normalized:
+            starts.append(offset)
+            offset += len(text) + len(_SEPARATOR)
+        for match in self.combined.finditer(_SEPARATOR.join(normalized)):
+            result[bisect_right(starts, match.start()) - 1] = True
+        return result
+
+    def match_terms(self, title):
+        """
+        Визначає, яким саме запитам відповідає назва.
+
+        Args:
+            title (str): Назва вакансії.
+
+        Returns:
+            list: Запити (у порядку terms), яким відповідає назва.
+        """
+        normalized = normalize_title(title)
+        if not self.prefilter.search(normalized):
+            return []
+        return [term for term, base, pattern in zip(self.terms, self.bases, self.patterns)
+                if base in normalized and pattern.search(normalized)]
+
+
+@lru_cache(maxsize=128)
+def _cached_matcher(terms):
+    return VacancyMatcher(terms)
+
+
+def get_matcher(terms):
+    """
+    Повертає скомпільований VacancyMatcher, кешований між запитами (LRU).
+
+    Args:
+        terms (str | list | tuple): Назва вакансії або кілька назв.
+
+    Returns:
+        VacancyMatcher: Матчер для цих запитів.
+    """
+    if isinstance(terms, str):
+        terms = (terms,)
+    return _cached_matcher(tuple(term.lower().strip() for term in terms))
@@ -0,0 +1,195 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+# Межі кошиків гістограми часу етапів, секунди
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float("inf"))
+
+PREFIX = "workua_"
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels) + (list(extra) if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in items) + "}"
+
+
+class Metrics:
+    """
+    Потокобезпечні лічильники та гістограми часу для етапів парсингу
+    (fetch, wait, browser, parse, filter, write) з експортом у JSON або текстовий формат Prometheus.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Обнуляє всі метрики та час початку вимірювання."""
+        with self.lock:
+            self.started = time.monotonic()
+            self.counters = {}
+            self.histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        """
+        Збільшує лічильник.
+
+        Args:
+            name (str): Назва лічильника (наприклад, "pages_total").
+            value (float): На скільки збільшити.
+            **labels: Мітки (наприклад, field="salary").
+        """
+        key = (name, _label_key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def add_counts(self, name, counts, label):
+        """
+        Додає одразу кілька значень лічильника з різними значеннями однієї мітки.
+
+        Args:
+            name (str): Назва лічильника.
+            counts (dict): {значення мітки: приріст} (наприклад, Counter по сторінці).
+            label (str): Назва мітки.
+        """
+        with self.lock:
+            for label_value, value in counts.items():
+                key = (name, ((label, str(label_value)),))
+                self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        """
+        Записує значення в гістограму.
+
+        Args:
+            name (str): Назва гістограми.
+            seconds (float): Значення (тривалість у секундах).
+            **labels: Мітки (наприклад, stage="parse").
+        """
+        key = (name, _label_key(labels))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    histogram["buckets"][i] += 1
+                    break
+            histogram["sum"] += seconds
+            histogram["count"] += 1
+
+    @contextmanager
+    def timer(self, stage):
+        """
+        Вимірює тривалість блоку коду як етап stage у гістограмі stage_seconds.
+
+        Args:
+            stage (str): Назва етапу ("fetch", "wait", "browser", "parse", "filter", "write").
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - start, stage=stage)
+
+    def counter(self, name, **labels):
+        """Повертає поточне значення лічильника (0, якщо його ще не було)."""
+        with self.lock:
+            return self.counters.get((name, _label_key(labels)), 0)
+
+    def snapshot(self):
+        """
+        Повертає всі метрики у вигляді словника, придатного для JSON.
+
+        Returns:
+            dict: elapsed_seconds, rates (сторінок і карток за секунду, частки пропусків полів),
+                  counters та stages (кількість, сума, середнє і кошики для кожного етапу).
+        """
+        with self.lock:
+            elapsed = time.monotonic() - self.started
+            counters = {}
+            for (name, labels), value in sorted(self.counters.items()):
+                counters[name + _format_labels(labels)] = value
+            stages = {}
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                count = histogram["count"]
+                stages[name + _format_labels(labels)] = {
+                    "count": count,
+                    "sum": round(histogram["sum"], 6),
+                    "avg": round(histogram["sum"] / count, 6) if count else 0,
+                    "buckets": {("+Inf" if bound == float("inf") else str(bound)): value
+                                for bound, value in zip(BUCKETS, histogram["buckets"])},
+                }
+            plain = {}
+            for (name, labels), value in self.counters.items():
+                plain.setdefault(name, {})[labels] = value
+
+        pages = sum(plain.get("pages_total", {}).values())
+        cards = sum(plain.get("cards_total", {}).values())
+        rates = {
+            "pages_per_second": round(pages / elapsed, 3) if elapsed else 0,
+            "cards_per_second": round(cards / elapsed, 3) if elapsed else 0,
+        }
+        if cards:
+            for labels, value in plain.get("field_missing_total", {}).items():
+                rates[f"missing_rate{_format_labels(labels)}"] = round(value / cards, 4)
+            for labels, value in plain.get("city_method_total", {}).items():
+                rates[f"city_method_rate{_format_labels(labels)}"] = round(value / cards, 4)
+        return {"elapsed_seconds": round(elapsed, 3), "rates": rates, "counters": counters, "stages": stages}
+
+    def to_prometheus(self):
+        """
+        Повертає метрики в текстовому форматі експозиції Prometheus.
+
+        Returns:
+            str: Текст метрик.
+        """
+        lines = []
+        with self.lock:
+            elapsed = time.monotonic() - self.started
+            names = sorted({name for name, _ in self.counters})
+            for name in names:
+                lines.append(f"# TYPE {PREFIX}{name} counter")
+                for (counter_name, labels), value in sorted(self.counters.items()):
+                    if counter_name == name:
+                        lines.append(f"{PREFIX}{name}{_format_labels(labels)} {value}")
+            names = sorted({name for name, _ in self.histograms})
+            for name in names:
+                lines.append(f"# TYPE {PREFIX}{name} histogram")
+                for (histogram_name, labels), histogram in sorted(self.histograms.items()):
+                    if histogram_name != name:
+                        continue
+                    cumulative = 0
+                    for bound, value in zip(BUCKETS, histogram["buckets"]):
+                        cumulative += value
+                        le = "+Inf" if bound == float("inf") else str(bound)
+                        lines.append(f"{PREFIX}{name}_bucket{_format_labels(labels, [('le', le)])} {cumulative}")
+                    lines.append(f"{PREFIX}{name}_sum{_format_labels(labels)} {histogram['sum']:.6f}")
+                    lines.append(f"{PREFIX}{name}_count{_format_labels(labels)} {histogram['count']}")
+        lines.append(f"# TYPE {PREFIX}elapsed_seconds gauge")
+        lines.append(f"{PREFIX}elapsed_seconds {elapsed:.3f}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """
+        Зберігає метрики у файл: .prom — формат Prometheus, інакше JSON.
+
+        Args:
+            path (str): Шлях до файлу.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            if path.endswith(".prom"):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+
+
+# Спільний екземпляр для всього процесу (як і налаштування logging)
+METRICS = Metrics()
@@ -0,0 +1,345 @@
+import logging
+import re
+from collections import Counter
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+
+from workua_metrics import METRICS
+
+try:
+    import lxml.html
+except ImportError:  # lxml необов'язковий: без нього використовується html.parser
+    lxml = None
+
+# Доступні бекенди: "lxml" — дерево lxml.html (C), "html.parser" — BeautifulSoup без залежностей
+BACKENDS = ("lxml", "html.parser")
+DEFAULT_BACKEND = "lxml" if lxml is not None else "html.parser"
+
+SALARY_RE = re.compile(r"\d+[  ]?\–[  ]?\d+|\d+")
+CITY_RE = re.compile(r"^[А-ЯІЇЄҐ][а-яіїєґ\s,-]+")
+CITY_FULL_RE = re.compile(r"^[А-ЯІЇЄҐ][а-яіїєґ\s,-]+$")
+CITY_REJECT_RE = re.compile(r"[()№\d]")
+PUBLISHED_RE = re.compile(r"вакансія від (\d{1,2} [а-я]+ \d{4})")
+MONTHS = ["січня", "лютого", "березня", "квітня", "травня", "червня",
+          "липня", "серпня", "вересня", "жовтня", "листопада", "грудня"]
+
+JOB_LINK_XPATH = "//div[contains(concat(' ', normalize-space(@class), ' '), ' job-link ')]"
+
+
+def resolve_backend(backend):
+    """
+    Повертає бекенд, який реально можна використати (lxml може бути не встановлений).
+
+    Args:
+        backend (str): Бажаний бекенд із BACKENDS.
+
+    Returns:
+        str: Назва доступного бекенду.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Невідомий бекенд парсера: {backend}")
+    if backend == "lxml" and lxml is None:
+        logging.warning("lxml не встановлено, використовуємо html.parser")
+        return "html.parser"
+    return backend
+
+
+class _Bs4Ops:
+    """Доступ до вузлів дерева BeautifulSoup."""
+
+    @staticmethod
+    def tag(el):
+        return el.name
+
+    @staticmethod
+    def classes(el):
+        return el.get("class")
+
+    @staticmethod
+    def text(el):
+        return el.get_text()
+
+    @staticmethod
+    def attr(el, name):
+        return el.get(name)
+
+    @staticmethod
+    def descendants(el):
+        return (child for child in el.descendants if child.name is not None)
+
+    @staticmethod
+    def ancestors(el):
+        return el.parents
+
+    @staticmethod
+    def element_children(el):
+        return [child for child in el.children if child.name is not None]
+
+    @staticmethod
+    def parent(el):
+        return el.parent
+
+    @staticmethod
+    def own_string(el):
+        return el.string
+
+
+class _LxmlOps:
+    """Доступ до вузлів дерева lxml.html з тією ж семантикою, що й у BeautifulSoup."""
+
+    @staticmethod
+    def tag(el):
+        return el.tag if isinstance(el.tag, str) else None
+
+    @staticmethod
+    def classes(el):
+        value = el.get("class")
+        return None if value is None else value.split()
+
+    @staticmethod
+    def text(el):
+        return el.text_content()
+
+    @staticmethod
+    def attr(el, name):
+        return el.get(name)
+
+    @staticmethod
+    def descendants(el):
+        return (child for child in el.iterdescendants() if isinstance(child.tag, str))
+
+    @staticmethod
+    def ancestors(el):
+        return el.iterancestors()
+
+    @staticmethod
+    def element_children(el):
+        return [child for child in el if isinstance(child.tag, str)]
+
+    @staticmethod
+    def parent(el):
+        return el.getparent()
+
+    @staticmethod
+    def own_string(el):
+        # Аналог Tag.string: текст є лише тоді, коли в елемента рівно один дочірній вузол
+        children = list(el)
+        if not children:
+            return el.text
+        if len(children) == 1 and not el.text and not children[0].tail and isinstance(children[0].tag, str):
+            return _LxmlOps.own_string(children[0])
+        return None
+
+
+def _has_class(ops, el, name):
+    classes = ops.classes(el)
+    return classes is not None and name in classes
+
+
+def convert_iso_to_text(iso_date):
+    """
+    Перетворює дату у форматі ISO (YYYY-MM-DD HH:MM:SS) у текстовий формат (DD місяць YYYY).
+
+    Args:
+        iso_date (str): Дата у форматі ISO (наприклад, "2025-04-15 12:00:00").
+
+    Returns:
+        str: Дата у текстовому форматі (наприклад, "15 квітня 2025") або оригінальна дата, якщо формат неправильний.
+    """
+    try:
+        date_obj = datetime.strptime(iso_date, "%Y-%m-%d %H:%M:%S")
+        return f"{date_obj.day} {MONTHS[date_obj.month - 1]} {date_obj.year}"
+    except ValueError:
+        return iso_date
+
+
+def _find_city_fallback(ops, job, city_block, company):
+    """Методи 3 і 4 пошуку міста — виконуються лише тоді, коли методи 1–2 нічого не дали."""
+    # Метод 3: Аналіз <div class="mt-xs"> для пошуку тексту, схожого на місто
+    if city_block is not None:
+        found_company = False
+        company_prefix = company.split()[0] if company.split() else company
+        for element in ops.descendants(city_block):
+            if ops.tag(element) not in ("span", "p"):
+                continue
+            text = ops.text(element).strip()
+            if not found_company and any(ops.tag(a) == "span" and _has_class(ops, a, "mr-xs")
+                                         for a in ops.ancestors(element)):
+                found_company = True
+                continue
+            match = CITY_RE.match(text)
+            if match:
+                city_text = match.group(0).rstrip(",").strip()
+                if not CITY_REJECT_RE.search(city_text) and not text.startswith(company_prefix):
+                    return city_text.split(",")[0].strip(), 3
+    # Метод 4: еквівалент селектора "div.mt-xs span:nth-child(3)"
+    for element in ops.descendants(job):
+        if ops.tag(element) != "span":
+            continue
+        siblings = ops.element_children(ops.parent(element))
+        if len(siblings) < 3 or siblings[2] is not element:
+            continue
+        if not any(ops.tag(a) == "div" and _has_class(ops, a, "mt-xs") for a in ops.ancestors(element)):
+            continue
+        city_text = ops.text(element).strip().rstrip(",").strip()
+        if CITY_FULL_RE.match(city_text):
+            return city_text.split(",")[0].strip(), 4
+        break
+    return "Не вказано", 0
+
+
+def extract_card(job, ops, stats=None):
+    """
+    Витягує всі поля вакансії за один обхід картки div.job-link.
+
+    Під час обходу запам'ятовуються перші елементи, які використовує кожне поле
+    (h2, div.mt-xs, span.strong-600 із числом, span з порожнім class, span.location, time),
+    після чого поля заповнюються без повторних пошуків. Результат збігається з
+    попереднім багатопрохідним парсером (bench/legacy_parser.parse_job_card).
+
+    Args:
+        job: Картка вакансії (bs4.element.Tag або lxml.html.HtmlElement).
+        ops: Адаптер дерева (_Bs4Ops або _LxmlOps).
+        stats (Counter): Якщо задано, сюди додаються номер методу, яким знайдено місто
+                         ("city_1"…"city_4"), та відсутні поля ("missing_salary" тощо).
+
+    Returns:
+        dict: Запис вакансії з ключами title, company, salary, city, published_time, link.
+    """
+    h2 = company_div = salary_tag = city_span = location_tag = time_tag = None
+    for el in ops.descendants(job):
+        name = ops.tag(el)
+        if name == "span":
+            classes = ops.classes(el)
+            if classes is None:
+                continue
+            if salary_tag is None and "strong-600" in classes:
+                string = ops.own_string(el)
+                if string is not None and SALARY_RE.search(string):
+                    salary_tag = el
+            if city_span is None and not classes:
+                city_span = el
+            if location_tag is None and "location" in classes:
+                location_tag = el
+        elif name == "h2":
+            if h2 is None:
+                h2 = el
+        elif name == "div":
+            if company_div is None and _has_class(ops, el, "mt-xs"):
+                company_div = el
+        elif name == "time":
+            if time_tag is None:
+                time_tag = el
+
+    title = ops.text(h2).strip() if h2 is not None else "Не знайдено"
+
+    company = "Невідомо"
+    if company_div is not None:
+        for el in ops.descendants(company_div):
+            if ops.tag(el) == "span" and _has_class(ops, el, "strong-600"):
+                company = ops.text(el).strip()
+                break
+
+    salary = "Не вказано"
+    if salary_tag is not None:
+        salary = ops.text(salary_tag).strip().replace(" ", "").replace(" ", "").replace("грн", "").replace(" ", "")
+
+    # Спроба знайти місто кількома методами через непередбачувану структуру сайту
+    city, city_method = "Не вказано", 0
+    if city_span is not None:
+        city, city_method = ops.text(city_span).strip().rstrip(",").strip(), 1
+    if city == "Не вказано" and location_tag is not None:
+        city, city_method = ops.text(location_tag).strip(), 2
+    if city == "Не вказано":
+        city, city_method = _find_city_fallback(ops, job, company_div, company)
+
+    title_link = None
+    if h2 is not None:
+        title_link = next((el for el in ops.descendants(h2) if ops.tag(el) == "a"), None)
+
+    published_time = "Не вказано"
+    if title_link is not None and ops.attr(title_link, "title") is not None:
+        match = PUBLISHED_RE.search(ops.attr(title_link, "title"))
+        if match:
+            published_time = match.group(1)
+    if published_time == "Не вказано" and time_tag is not None:
+        if ops.attr(time_tag, "datetime") is not None:
+            published_time = convert_iso_to_text(ops.attr(time_tag, "datetime"))
+        else:
+            published_time = ops.text(time_tag).strip()
+
+    if title_link is not None:
+        link = "https://www.work.ua" + ops.attr(title_link, "href")
+    else:
+        link = "Посилання не знайдено"
+
+    if stats is not None:
+        if city_method:
+            stats[f"city_{city_method}"] += 1
+        for field, value in (("company", company), ("salary", salary), ("city", city),
+                             ("published_time", published_time)):
+            if value in ("Не вказано", "Невідомо"):
+                stats[f"missing_{field}"] += 1
+
+    return {"title": title, "company": company, "salary": salary, "city": city,
+            "published_time": published_time, "link": link}
+
+
+def find_cards(html, backend=DEFAULT_BACKEND):
+    """
+    Будує дерево сторінки обраним бекендом і знаходить картки div.job-link.
+
+    Args:
+        html (str): HTML сторінки.
+        backend (str): Бекенд із BACKENDS.
+
+    Returns:
+        tuple: (список карток, адаптер дерева для extract_card).
+    """
+    backend = resolve_backend(backend)
+    if not html or not html.strip():
+        return [], None
+    if backend == "lxml":
+        root = lxml.html.fromstring(html)
+        return root.xpath(JOB_LINK_XPATH), _LxmlOps
+    soup = BeautifulSoup(html, "html.parser")
+    return soup.find_all("div", class_="job-link"), _Bs4Ops
+
+
+def parse_cards(html, backend=DEFAULT_BACKEND):
+    """
+    Розбирає всі картки вакансій на сторінці.
+
+    Args:
+        html (str): HTML сторінки.
+        backend (str): Бекенд із BACKENDS.
+
+    Returns:
+        list: Записи вакансій у порядку карток; None на місці картки, яку не вдалося обробити.
+    """
+    cards, ops = find_cards(html, backend)
+    records = []
+    stats = Counter()
+    for job in cards:
+        try:
+            record = extract_card(job, ops, stats)
+        except Exception as e:
+            logging.error(f"Помилка при обробці вакансії: {str(e)}")
+            stats["errors"] += 1
+            record = None
+        else:
+            if record["city"] == "Не вказано":
+                logging.debug(f"Місто не знайдено для вакансії {record['title']}")
+            if record["published_time"] == "Не вказано":
+                logging.debug(f"Час публікації не знайдено для вакансії {record['title']}")
+        records.append(record)
+
+    # Лічильники сторінки додаються до спільних метрик одним викликом, а не для кожної картки
+    METRICS.add_counts("city_method_total", {key[5:]: value for key, value in stats.items()
+                                             if key.startswith("city_")}, "method")
+    METRICS.add_counts("field_missing_total", {key[8:]: value for key, value in stats.items()
+                                               if key.startswith("missing_")}, "field")
+    if stats["errors"]:
+        METRICS.inc("parse_errors_total", stats["errors"])
+    return records
@@ -0,0 +1,289 @@
+import csv
+import heapq
+import json
+import os
+import tempfile
+from datetime import date
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow необов'язковий: потрібен лише для експорту в Parquet/Arrow
+    pa = pq = None
+
+# Поля запису вакансії та відповідні заголовки CSV
+FIELDS = ["title", "company", "salary", "city", "published_time", "link"]
+CSV_HEADER = ["Назва вакансії", "Компанія", "Зарплата", "Місто", "Час публікації", "Посилання"]
+
+# Поля зі сторінки вакансії (див. workua_details), якщо увімкнено доповнення записів
+DETAIL_FIELDS = ["description", "employment_type", "salary_exact"]
+DETAIL_HEADER = ["Опис", "Тип зайнятості", "Точна зарплата"]
+
+COLUMNAR_EXTENSIONS = (".parquet", ".arrow", ".feather")
+
+
+class CsvSink:
+    """Записує вакансії у CSV по одному рядку, щойно вони надходять."""
+
+    def __init__(self, path, fields=None, header=None):
+        """
+        Args:
+            path (str): Шлях до CSV-файлу (перезаписується).
+            fields (list): Ключі записів у порядку колонок (за замовчуванням FIELDS).
+            header (list): Заголовки колонок (за замовчуванням із CSV_HEADER і DETAIL_HEADER, інакше fields).
+        """
+        self.path = path
+        self.fields = fields or FIELDS
+        if header is None:
+            headers = dict(zip(FIELDS + DETAIL_FIELDS, CSV_HEADER + DETAIL_HEADER))
+            header = [headers.get(field, field) for field in self.fields]
+        self.count = 0
+        self.file = open(path, "w", newline="", encoding="UTF-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(header)
+
+    def write(self, record):
+        """
+        Дописує запис у файл і скидає буфер на диск.
+
+        Args:
+            record (dict): Запис вакансії.
+        """
+        self.writer.writerow([record.get(field, "") for field in self.fields])
+        self.file.flush()
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class JsonlSink:
+    """Записує вакансії у JSON Lines (один JSON-об'єкт на рядок), щойно вони надходять."""
+
+    def __init__(self, path, fields=None):
+        """
+        Args:
+            path (str): Шлях до JSONL-файлу (перезаписується).
+            fields (list): Ключі, які потрапляють у файл (None — усі ключі запису).
+        """
+        self.path = path
+        self.fields = fields
+        self.count = 0
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, record):
+        """
+        Дописує запис у файл і скидає буфер на диск.
+
+        Args:
+            record (dict): Запис вакансії.
+        """
+        if self.fields:
+            record = {field: record.get(field, "") for field in self.fields}
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ColumnarSink:
+    """
+    Записує вакансії в Parquet або Arrow IPC (.arrow, .feather) з типізованими колонками:
+    salary_min, salary_max, salary_mid (цілі числа) та published_date (дата) поруч із
+    текстовими полями. Записи накопичуються по колонках і скидаються у файл групою рядків
+    (row group / record batch), коли їх набирається row_group_size або під час flush
+    (run_query викликає його після кожної сторінки). Футер файлу записується в close,
+    тож до цього файл не читається.
+    """
+
+    def __init__(self, path, fields=None, salary_key=None, date_key=None, row_group_size=5000):
+        """
+        Args:
+            path (str): Шлях до файлу (перезаписується).
+            fields (list): Текстові поля запису (за замовчуванням FIELDS).
+            salary_key (callable): Зарплата → (мінімум, максимум) або None (див. work_scrap.parse_salary_range).
+            date_key (callable): Час публікації → дата ISO або None (див. work_scrap.parse_published_date).
+            row_group_size (int): Кількість записів в одній групі рядків.
+
+        Raises:
+            ImportError: pyarrow не встановлено.
+        """
+        if pa is None:
+            raise ImportError("Для експорту в Parquet/Arrow потрібен pyarrow (pip install pyarrow)")
+        self.path = path
+        self.fields = fields or FIELDS
+        self.salary_key = salary_key
+        self.date_key = date_key
+        self.row_group_size = row_group_size
+        self.count = 0
+        columns = []
+        for field in self.fields:
+            columns.append(pa.field(field, pa.string()))
+            if field == "salary":
+                columns += [pa.field(name, pa.int64()) for name in ("salary_min", "salary_max", "salary_mid")]
+            elif field == "published_time":
+                columns.append(pa.field("published_date", pa.date32()))
+        self.schema = pa.schema(columns)
+        self.columns = {name: [] for name in self.schema.names}
+        if path.endswith(".parquet"):
+            self.file = None
+            self.writer = pq.ParquetWriter(path, self.schema)
+        else:
+            self.file = pa.OSFile(path, "wb")
+            self.writer = pa.ipc.new_file(self.file, self.schema)
+
+    def write(self, record):
+        """
+        Додає запис до поточної групи рядків; повна група одразу записується у файл.
+
+        Args:
+            record (dict): Запис вакансії.
+        """
+        for field in self.fields:
+            self.columns[field].append(record.get(field, ""))
+        if "salary" in self.columns:
+            salary_range = self.salary_key(record.get("salary", "")) if self.salary_key else None
+            low, high = salary_range if salary_range else (None, None)
+            self.columns["salary_min"].append(low)
+            self.columns["salary_max"].append(high)
+            self.columns["salary_mid"].append((low + high) // 2 if salary_range else None)
+        if "published_date" in self.columns:
+            iso_date = self.date_key(record.get("published_time", "")) if self.date_key else None
+            self.columns["published_date"].append(date.fromisoformat(iso_date) if iso_date else None)
+        self.count += 1
+        if len(self.columns[self.fields[0]]) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """Записує накопичені записи окремою групою рядків."""
+        if not self.columns[self.fields[0]]:
+            return
+        table = pa.Table.from_arrays([pa.array(self.columns[column.name], type=column.type) for column in self.schema],
+                                     schema=self.schema)
+        self.writer.write_table(table)
+        self.columns = {name: [] for name in self.schema.names}
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+        if self.file is not None:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_sink(path, fields=None, salary_key=None, date_key=None):
+    """
+    Створює sink за розширенням файлу (.jsonl — JSON Lines, .parquet/.arrow/.feather — ColumnarSink, інакше CSV).
+
+    Args:
+        path (str): Шлях до файлу.
+        fields (list): Ключі записів у порядку колонок.
+        salary_key (callable): Розбір діапазону зарплати (лише для Parquet/Arrow).
+        date_key (callable): Розбір дати публікації (лише для Parquet/Arrow).
+
+    Returns:
+        CsvSink | JsonlSink | ColumnarSink: Відкритий sink.
+    """
+    if path.endswith(COLUMNAR_EXTENSIONS):
+        return ColumnarSink(path, fields, salary_key=salary_key, date_key=date_key)
+    if path.endswith(".jsonl"):
+        return JsonlSink(path, fields)
+    return CsvSink(path, fields)
+
+
+def read_records(path, fields=None):
+    """
+    Послідовно читає записи з CSV або JSONL, не завантажуючи файл у пам'ять повністю.
+
+    Args:
+        path (str): Шлях до файлу, створеного CsvSink або JsonlSink.
+        fields (list): Ключі колонок CSV (за замовчуванням FIELDS).
+
+    Yields:
+        dict: Запис вакансії.
+    """
+    if path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        fields = fields or FIELDS
+        with open(path, newline="", encoding="UTF-8") as f:
+            reader = csv.reader(f)
+            next(reader, None)  # Заголовок
+            for row in reader:
+                yield dict(zip(fields, row))
+
+
+def _spill(chunk, key, reverse, tmp_dir):
+    """Сортує фрагмент у пам'яті та записує його в тимчасовий JSONL-файл."""
+    chunk.sort(key=key, reverse=reverse)
+    fd, path = tempfile.mkstemp(prefix="workua_sort_", suffix=".jsonl", dir=tmp_dir)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        for record in chunk:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return path
+
+
+def external_sort(records, key, reverse=False, chunk_size=5000, tmp_dir=None):
+    """
+    Сортує потік записів зовнішнім сортуванням злиттям: записи накопичуються фрагментами
+    по chunk_size, кожен фрагмент сортується й скидається на диск, після чого фрагменти
+    зливаються через heapq.merge. У пам'яті одночасно тримається не більше одного фрагмента
+    та по одному запису з кожного файлу. Сортування стабільне, як і list.sort.
+
+    Args:
+        records (iterable): Записи вакансій.
+        key (callable): Функція ключа сортування.
+        reverse (bool): Сортування за спаданням.
+        chunk_size (int): Кількість записів в одному фрагменті.
+        tmp_dir (str): Каталог для тимчасових файлів (за замовчуванням системний).
+
+    Yields:
+        dict: Записи у відсортованому порядку.
+    """
+    paths = []
+    files = []
+    try:
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                paths.append(_spill(chunk, key, reverse, tmp_dir))
+                chunk = []
+        if not paths:
+            # Усі записи помістились в один фрагмент — диск не потрібен
+            chunk.sort(key=key, reverse=reverse)
+            yield from chunk
+            return
+        if chunk:
+            paths.append(_spill(chunk, key, reverse, tmp_dir))
+        chunk = None
+        files = [open(path, encoding="utf-8") for path in paths]
+        streams = [(json.loads(line) for line in f) for f in files]
+        yield from heapq.merge(*streams, key=key, reverse=reverse)
+    finally:
+        for f in files:
+            f.close()
+        for path in paths:
+            os.remove(path)
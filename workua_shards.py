@@ -0,0 +1,390 @@
+"""
+Розподілений режим: запити діляться на частини (шарди) за містом і діапазоном сторінок,
+які виконують кілька процесів або кілька машин зі спільним каталогом черги.
+
+Каталог черги:
+    pending/   — завдання (по одному JSON-файлу на шард), які ще ніхто не взяв;
+    claimed/   — завдання в роботі (забираються атомарним перейменуванням);
+    done/      — виконані завдання;
+    failed/    — завдання, що зупинилися на помилці (повертаються командою requeue);
+    output/    — частковий результат кожного шарду (JSONL, відсортований за зарплатою);
+    checkpoints/ — прогрес незавершених шардів (повторний запуск продовжує з першої необробленої сторінки).
+
+Черга належить одному плану: plan відмовляється працювати з чергою, де вже є завдання чи результати,
+доки не задано --resume (продовжити той самий план) або --fresh (очистити чергу, наприклад для щоденного запуску).
+
+Парсинг обмежений GIL, тому шарди виконуються окремими процесами; на кожній машині,
+що має доступ до каталогу черги, можна запустити "work" незалежно.
+
+Використання:
+    python workua_shards.py plan --queue shards -v водій --all-cities --shard-pages 5
+    python workua_shards.py work --queue shards --processes 4
+    python workua_shards.py merge --queue shards --output workua_jobs_all.csv
+    python workua_shards.py run --queue shards -v водій -c київ -c львів --processes 4 --output workua_jobs_all.csv
+    python workua_shards.py run --queue shards --fresh -v водій --all-cities   # щоденний запуск з нуля
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import shutil
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import work_scrap
+from work_scrap import PageError, fetch_page_count, parse_salary, scrape_pages
+from workua_batch import merge_outputs, parse_pages, query_slug
+from workua_cache import HttpCache
+from workua_checkpoint import CheckpointStore
+from workua_fetch import ListingFetcher, build_listing_url, crawl_pages
+from workua_pipeline import COLUMNAR_EXTENSIONS, JsonlSink, external_sort, pa
+
+# Обласні центри (без тимчасово окупованих), для --all-cities
+OBLAST_CENTRES = ["київ", "вінниця", "луцьк", "дніпро", "житомир", "ужгород", "запоріжжя", "івано-франківськ",
+                  "кропивницький", "львів", "миколаїв", "одеса", "полтава", "рівне", "суми", "тернопіль",
+                  "харків", "херсон", "хмельницький", "черкаси", "чернівці", "чернігів"]
+
+QUEUE_DIRS = ("pending", "claimed", "done", "failed", "output", "checkpoints")
+
+Shard = namedtuple("Shard", ["vacancy", "city", "first_page", "last_page"])
+
+
+def shard_name(shard):
+    """Формує ім'я файлів шарду (наприклад, "київ-водій_p0001-0005")."""
+    return f"{query_slug(shard.vacancy, shard.city)}_p{shard.first_page:04d}-{shard.last_page:04d}"
+
+
+def init_queue(queue_dir):
+    for name in QUEUE_DIRS:
+        os.makedirs(os.path.join(queue_dir, name), exist_ok=True)
+
+
+def queue_in_use(queue_dir):
+    """True, якщо в черзі вже є завдання або часткові результати попереднього плану."""
+    return any(os.listdir(path) for path in (os.path.join(queue_dir, state)
+                                             for state in ("pending", "claimed", "done", "failed", "output"))
+               if os.path.isdir(path))
+
+
+def clear_queue(queue_dir):
+    """Видаляє всі завдання, контрольні точки й часткові результати черги."""
+    for name in QUEUE_DIRS:
+        shutil.rmtree(os.path.join(queue_dir, name), ignore_errors=True)
+    init_queue(queue_dir)
+
+
+def open_cache():
+    """Відкриває спільний дисковий кеш сторінок, якщо його увімкнено в work_scrap."""
+    if not work_scrap.HTTP_CACHE_DIR:
+        return None
+    return HttpCache(work_scrap.HTTP_CACHE_DIR, work_scrap.HTTP_CACHE_TTL, work_scrap.HTTP_CACHE_MAX_MB * 2 ** 20)
+
+
+def split_pages(vacancy, city, max_pages, shard_pages):
+    """
+    Ділить сторінки запиту на діапазони.
+
+    Args:
+        vacancy (str): Назва вакансії.
+        city (str): Місто.
+        max_pages (int): Кількість сторінок запиту.
+        shard_pages (int): Кількість сторінок в одному шарді.
+
+    Returns:
+        list: Шарди (Shard) у порядку сторінок.
+    """
+    return [Shard(vacancy, city, first, min(first + shard_pages - 1, max_pages))
+            for first in range(1, max_pages + 1, shard_pages)]
+
+
+def plan(queue_dir, queries, shard_pages=5, resume=False):
+    """
+    Створює завдання в черзі. Для запитів без заданої кількості сторінок вона визначається
+    за пагінацією першої сторінки; запит, перша сторінка якого не завантажилась (немає ні карток,
+    ні повідомлення про відсутність вакансій), пропускається, а не планується на одну сторінку.
+
+    Args:
+        queue_dir (str): Каталог черги.
+        queries (list): Трійки (вакансія, місто, кількість сторінок або None).
+        shard_pages (int): Кількість сторінок в одному шарді.
+        resume (bool): Доповнити план у черзі, що вже використовується (наявні шарди не створюються повторно).
+
+    Returns:
+        tuple: (кількість створених завдань, список пропущених запитів (вакансія, місто)).
+
+    Raises:
+        FileExistsError: Черга містить завдання чи результати іншого плану, а resume не задано
+            (інакше виконані раніше шарди не завантажились би знову, а merge взяв би їхні старі результати).
+    """
+    if not resume and queue_in_use(queue_dir):
+        raise FileExistsError(f"черга {queue_dir} вже містить завдання або результати попереднього плану")
+    init_queue(queue_dir)
+    created = 0
+    skipped = []
+    cache = open_cache()
+    try:
+        with ListingFetcher(rate_limiter=work_scrap.create_rate_limiter(), cache=cache,
+                            headless=work_scrap.BROWSER_HEADLESS) as fetcher:
+            for vacancy, city, max_pages in queries:
+                if max_pages is None:
+                    try:
+                        max_pages, _ = fetch_page_count(fetcher, vacancy, city)
+                    except PageError as e:
+                        print(f"❌ {vacancy} / {city}: {e}, запит пропущено")
+                        logging.error(f"Запит {vacancy} / {city} не заплановано: {e}")
+                        skipped.append((vacancy, city))
+                        continue
+                for shard in split_pages(vacancy, city, max_pages, shard_pages):
+                    name = shard_name(shard)
+                    if any(os.path.exists(os.path.join(queue_dir, state, f"{name}.json"))
+                           for state in ("pending", "claimed", "done", "failed")):
+                        continue
+                    with open(os.path.join(queue_dir, "pending", f"{name}.json"), "w", encoding="utf-8") as f:
+                        json.dump(shard._asdict(), f, ensure_ascii=False)
+                    created += 1
+                print(f"📋 {vacancy} / {city}: {max_pages} сторінок")
+    finally:
+        if cache is not None:
+            cache.close()
+    logging.info(f"Створено {created} завдань у {queue_dir}")
+    return created, skipped
+
+
+def claim(queue_dir):
+    """
+    Забирає наступне завдання з черги. Перейменування атомарне, тож одне завдання
+    не дістанеться двом процесам (чи машинам), навіть якщо вони беруть його одночасно.
+
+    Returns:
+        tuple: (Shard, шлях до файлу завдання в claimed) або None, якщо черга порожня.
+    """
+    for path in sorted(glob.glob(os.path.join(queue_dir, "pending", "*.json"))):
+        claimed = os.path.join(queue_dir, "claimed", os.path.basename(path))
+        try:
+            os.rename(path, claimed)
+        except OSError:
+            continue  # Завдання вже взяв інший процес
+        with open(claimed, encoding="utf-8") as f:
+            return Shard(**json.load(f)), claimed
+    return None
+
+
+def run_shard(fetcher, shard, queue_dir):
+    """
+    Виконує шард: завантажує й фільтрує його сторінки з контрольними точками, а після
+    завершення записує частковий результат output/<шард>.jsonl, відсортований за зарплатою.
+
+    Args:
+        fetcher (ListingFetcher): Завантажувач сторінок.
+        shard (Shard): Завдання.
+        queue_dir (str): Каталог черги.
+
+    Returns:
+        int: Кількість записів у частковому результаті.
+
+    Raises:
+        PageError: Сторінка не завантажилась; прогрес шарду збережено.
+    """
+    name = shard_name(shard)
+    checkpoint_path = os.path.join(queue_dir, "checkpoints", f"{name}.sqlite3")
+    checkpoint = CheckpointStore(checkpoint_path)
+    try:
+        checkpoint.begin(shard.vacancy, shard.city, shard.last_page)
+        start_page = checkpoint.next_page(shard.vacancy, shard.city, shard.first_page)
+        page_urls = ((page, build_listing_url(shard.city, shard.vacancy, page))
+                     for page in range(start_page, shard.last_page + 1))
+        pages = crawl_pages(fetcher, page_urls, workers=work_scrap.CONCURRENCY)
+        try:
+            for page, records in scrape_pages(pages, shard.vacancy, shard.city, fetcher.cache):
+                checkpoint.save_page(shard.vacancy, shard.city, page, records)
+        finally:
+            pages.close()
+
+        records = (record for _, page_records in checkpoint.pages(shard.vacancy, shard.city)
+                   for record in page_records)
+        output = os.path.join(queue_dir, "output", f"{name}.jsonl")
+        # Спочатку у тимчасовий файл: merge бачить лише повністю записані частини
+        with JsonlSink(output + ".tmp") as sink:
+            for record in external_sort(records, key=lambda x: parse_salary(x["salary"]), reverse=True,
+                                        chunk_size=work_scrap.SORT_CHUNK_SIZE):
+                sink.write(record)
+        os.replace(output + ".tmp", output)
+    finally:
+        checkpoint.close()
+    os.remove(checkpoint_path)
+    return sink.count
+
+
+def work(queue_dir, processes=1):
+    """
+    Цикл одного процесу: бере завдання з черги, доки вона не спорожніє.
+
+    Args:
+        queue_dir (str): Каталог черги.
+        processes (int): Кількість процесів, що працюють одночасно (частота запитів ділиться між ними).
+
+    Returns:
+        tuple: (кількість виконаних шардів, кількість шардів із помилкою).
+    """
+    init_queue(queue_dir)
+    done = failed = 0
+    cache = open_cache()
+    rate_limiter = work_scrap.create_rate_limiter(processes)
+    try:
+        with ListingFetcher(rate_limiter=rate_limiter, max_per_host=work_scrap.CONCURRENCY, cache=cache,
+                            headless=work_scrap.BROWSER_HEADLESS) as fetcher:
+            while True:
+                task = claim(queue_dir)
+                if task is None:
+                    break
+                shard, claimed = task
+                name = shard_name(shard)
+                try:
+                    count = run_shard(fetcher, shard, queue_dir)
+                except Exception as e:
+                    # PageError або інший збій: завдання повертається командою requeue і продовжиться з контрольної точки
+                    logging.error(f"Шард {name} завершився помилкою: {str(e)}")
+                    print(f"❌ {name}: {e}")
+                    os.replace(claimed, os.path.join(queue_dir, "failed", os.path.basename(claimed)))
+                    failed += 1
+                    continue
+                os.replace(claimed, os.path.join(queue_dir, "done", os.path.basename(claimed)))
+                print(f"✅ {name}: {count} вакансій")
+                logging.info(f"Шард {name} виконано: {count} вакансій")
+                done += 1
+    finally:
+        if cache is not None:
+            cache.close()
+    return done, failed
+
+
+def work_pool(queue_dir, processes=4):
+    """
+    Запускає work у кількох процесах. Загальна частота запитів ділиться між процесами,
+    тож разом вони не перевищують MAX_REQUESTS_PER_SECOND.
+
+    Args:
+        queue_dir (str): Каталог черги.
+        processes (int): Кількість процесів.
+
+    Returns:
+        tuple: (кількість виконаних шардів, кількість шардів із помилкою).
+    """
+    if processes <= 1:
+        return work(queue_dir)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        results = list(executor.map(work, [queue_dir] * processes, [processes] * processes))
+    return sum(done for done, _ in results), sum(failed for _, failed in results)
+
+
+def requeue(queue_dir):
+    """
+    Повертає в чергу завдання з помилкою та завдання, взяті процесами, що аварійно завершились.
+    Запускати, коли жоден work не працює.
+
+    Returns:
+        int: Кількість повернених завдань.
+    """
+    init_queue(queue_dir)
+    moved = 0
+    for state in ("failed", "claimed"):
+        for path in glob.glob(os.path.join(queue_dir, state, "*.json")):
+            os.replace(path, os.path.join(queue_dir, "pending", os.path.basename(path)))
+            moved += 1
+    return moved
+
+
+def merge(queue_dir, output_file):
+    """
+    Зливає часткові результати шардів в один файл, відсортований за зарплатою, без дублікатів за посиланням.
+
+    Args:
+        queue_dir (str): Каталог черги.
+        output_file (str): Підсумковий файл (.csv, .jsonl або .parquet/.arrow).
+
+    Returns:
+        int: Кількість записів у підсумковому файлі.
+    """
+    unfinished = sum(len(glob.glob(os.path.join(queue_dir, state, "*.json"))) for state in ("pending", "claimed", "failed"))
+    if unfinished:
+        print(f"⚠️ Ще не виконано {unfinished} завдань, результат буде неповним")
+        logging.warning(f"Злиття з {unfinished} невиконаними завданнями в {queue_dir}")
+    paths = sorted(glob.glob(os.path.join(queue_dir, "output", "*.jsonl")))
+    return merge_outputs(paths, output_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Розподілений парсинг вакансій work.ua за містами і сторінками")
+    commands = parser.add_subparsers(dest="command", required=True)
+    plan_parser = commands.add_parser("plan", help="створити завдання в черзі")
+    work_parser = commands.add_parser("work", help="виконувати завдання, доки черга не спорожніє")
+    requeue_parser = commands.add_parser("requeue", help="повернути в чергу завдання з помилкою або незавершені")
+    merge_parser = commands.add_parser("merge", help="злити часткові результати")
+    run_parser = commands.add_parser("run", help="plan, work і merge однією командою")
+    for sub in (plan_parser, run_parser):
+        sub.add_argument("-v", "--vacancy", action="append", required=True, help="вакансія")
+        sub.add_argument("-c", "--city", action="append", default=[], help="місто")
+        sub.add_argument("--all-cities", action="store_true", help="усі обласні центри")
+        sub.add_argument("--pages", default="всі", help="кількість сторінок кожного запиту (число або 'всі')")
+        sub.add_argument("--shard-pages", type=int, default=5, help="кількість сторінок в одному шарді")
+        reuse = sub.add_mutually_exclusive_group()
+        reuse.add_argument("--resume", action="store_true", help="продовжити план у черзі, що вже використовується")
+        reuse.add_argument("--fresh", action="store_true", help="очистити чергу перед плануванням")
+    for sub in (work_parser, run_parser):
+        sub.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="кількість процесів")
+    for sub in (merge_parser, run_parser):
+        sub.add_argument("-o", "--output", default="workua_jobs_all.csv",
+                         help="підсумковий файл (.csv, .jsonl або .parquet/.arrow)")
+    for sub in (plan_parser, work_parser, requeue_parser, merge_parser, run_parser):
+        sub.add_argument("--queue", default="workua_shards", help="каталог черги (спільний для всіх машин)")
+    args = parser.parse_args()
+
+    if args.command in ("merge", "run") and pa is None and args.output.endswith(COLUMNAR_EXTENSIONS):
+        print("❌ Помилка: для експорту в Parquet/Arrow потрібен pyarrow (pip install pyarrow)")
+        sys.exit(1)
+
+    skipped = []
+    if args.command in ("plan", "run"):
+        cities = OBLAST_CENTRES if args.all_cities else [city.strip().lower() for city in args.city]
+        if not cities:
+            print("❌ Помилка: задайте --city або --all-cities")
+            sys.exit(1)
+        try:
+            pages = parse_pages(args.pages)
+        except ValueError as e:
+            print(f"❌ Помилка: {e}")
+            sys.exit(1)
+        queries = [(vacancy.strip().lower(), city, pages) for vacancy in args.vacancy for city in cities]
+        if args.fresh:
+            clear_queue(args.queue)
+        try:
+            created, skipped = plan(args.queue, queries, args.shard_pages, resume=args.resume)
+        except FileExistsError as e:
+            print(f"❌ Помилка: {e}. Задайте --resume, щоб продовжити його, або --fresh, щоб почати спочатку")
+            sys.exit(1)
+        print(f"🚀 Створено завдань: {created}")
+        if skipped:
+            print(f"⚠️ Не заплановано запитів (перша сторінка не завантажилась): {len(skipped)}")
+
+    if args.command == "requeue":
+        print(f"♻️ Повернено в чергу: {requeue(args.queue)}")
+
+    if args.command in ("work", "run"):
+        done, failed = work_pool(args.queue, args.processes)
+        print(f"📊 Виконано шардів: {done}, з помилкою: {failed}")
+        if failed:
+            print("♻️ Повторіть після python workua_shards.py requeue — шарди продовжаться з контрольних точок")
+
+    if args.command in ("merge", "run"):
+        count = merge(args.queue, args.output)
+        print(f"✅ Об'єднано {count} унікальних вакансій у {args.output}")
+        logging.info(f"Об'єднано {count} вакансій у {args.output}")
+
+    if skipped:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+
+# Поля, зміна яких вважається зміною вакансії
+STORE_FIELDS = ["title", "company", "salary", "city", "published_time"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    link TEXT PRIMARY KEY,
+    title TEXT,
+    company TEXT,
+    salary TEXT,
+    salary_value REAL,
+    city TEXT,
+    published_time TEXT,
+    published_date TEXT,
+    content_hash TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_city ON jobs (city);
+CREATE INDEX IF NOT EXISTS jobs_salary ON jobs (salary_value);
+CREATE INDEX IF NOT EXISTS jobs_published ON jobs (published_date);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    vacancy TEXT NOT NULL,
+    city TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    complete INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS query_jobs (
+    vacancy TEXT NOT NULL,
+    city TEXT NOT NULL,
+    link TEXT NOT NULL,
+    last_run INTEGER NOT NULL,
+    active INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (vacancy, city, link)
+);
+"""
+
+
+def content_hash(record):
+    """
+    Обчислює хеш змістовних полів вакансії для виявлення змін між запусками.
+
+    Args:
+        record (dict): Запис вакансії.
+
+    Returns:
+        str: SHA-1 у шістнадцятковому вигляді.
+    """
+    payload = json.dumps([record.get(field, "") for field in STORE_FIELDS], ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class JobStore:
+    """
+    Локальне сховище вакансій у SQLite з ключем за посиланням на вакансію.
+    Між запусками визначає нові, змінені та зниклі вакансії для кожного запиту (вакансія, місто).
+    """
+
+    def __init__(self, path, salary_key=None, date_key=None):
+        """
+        Args:
+            path (str): Шлях до файлу бази SQLite (створюється за потреби).
+            salary_key (callable): Перетворює текст зарплати на число для індексу salary_value.
+            date_key (callable): Перетворює час публікації на дату ISO для індексу published_date.
+        """
+        self.path = path
+        self.salary_key = salary_key
+        self.date_key = date_key
+        # timeout: у пакетному режимі кілька запитів пишуть у ту саму базу одночасно
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.executescript(SCHEMA)
+
+    def begin_run(self, vacancy, city):
+        """
+        Реєструє новий запуск запиту.
+
+        Args:
+            vacancy (str): Назва вакансії.
+            city (str): Місто.
+
+        Returns:
+            int: Ідентифікатор запуску.
+        """
+        with self.conn:
+            cursor = self.conn.execute("INSERT INTO runs (vacancy, city, started_at) VALUES (?, ?, ?)",
+                                       (vacancy, city, datetime.now().isoformat(timespec="seconds")))
+        return cursor.lastrowid
+
+    def upsert_page(self, run_id, vacancy, city, records):
+        """
+        Додає або оновлює записи сторінки в одній транзакції.
+
+        Args:
+            run_id (int): Ідентифікатор запуску.
+            vacancy (str): Назва вакансії.
+            city (str): Місто.
+            records (list): Записи вакансій.
+
+        Returns:
+            list: Статус кожного запису: "new", "changed" або "unchanged"
+                  (None для записів без посилання, які неможливо ідентифікувати).
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        statuses = []
+        with self.conn:
+            for record in records:
+                link = record.get("link", "")
+                if not link.startswith("http"):
+                    statuses.append(None)
+                    continue
+                digest = content_hash(record)
+                row = self.conn.execute("SELECT content_hash FROM jobs WHERE link = ?", (link,)).fetchone()
+                salary_value = self.salary_key(record["salary"]) if self.salary_key else None
+                published_date = self.date_key(record["published_time"]) if self.date_key else None
+                values = (record["title"], record["company"], record["salary"], salary_value, record["city"],
+                          record["published_time"], published_date, digest, now)
+                if row is None:
+                    self.conn.execute(
+                        "INSERT INTO jobs (title, company, salary, salary_value, city, published_time, "
+                        "published_date, content_hash, last_seen, first_seen, link) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", values + (now, link))
+                    status = "new"
+                else:
+                    self.conn.execute(
+                        "UPDATE jobs SET title = ?, company = ?, salary = ?, salary_value = ?, city = ?, "
+                        "published_time = ?, published_date = ?, content_hash = ?, last_seen = ? WHERE link = ?",
+                        values + (link,))
+                    status = "unchanged" if row[0] == digest else "changed"
+                self.conn.execute(
+                    "INSERT INTO query_jobs (vacancy, city, link, last_run, active) VALUES (?, ?, ?, ?, 1) "
+                    "ON CONFLICT (vacancy, city, link) DO UPDATE SET last_run = excluded.last_run, active = 1",
+                    (vacancy, city, link, run_id))
+                statuses.append(status)
+        return statuses
+
+    def finish_run(self, run_id, vacancy, city, complete=True):
+        """
+        Завершує запуск. Для повного запуску (усі сторінки переглянуто) вакансії запиту,
+        яких цього разу не було, позначаються зниклими.
+
+        Args:
+            run_id (int): Ідентифікатор запуску.
+            vacancy (str): Назва вакансії.
+            city (str): Місто.
+            complete (bool): Чи були переглянуті всі сторінки запиту.
+
+        Returns:
+            list: Посилання на вакансії, що зникли (порожній список для неповного запуску).
+        """
+        vanished = []
+        with self.conn:
+            if complete:
+                vanished = [row[0] for row in self.conn.execute(
+                    "SELECT link FROM query_jobs WHERE vacancy = ? AND city = ? AND active = 1 AND last_run < ?",
+                    (vacancy, city, run_id))]
+                self.conn.execute(
+                    "UPDATE query_jobs SET active = 0 WHERE vacancy = ? AND city = ? AND active = 1 AND last_run < ?",
+                    (vacancy, city, run_id))
+            self.conn.execute("UPDATE runs SET finished_at = ?, complete = ? WHERE id = ?",
+                              (datetime.now().isoformat(timespec="seconds"), int(complete), run_id))
+        return vanished
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()